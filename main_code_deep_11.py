@@ -1,19 +1,62 @@
 # app.py
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, render_template_string, jsonify, request, send_file
+import atexit
+import hashlib
+import json
+import queue
 import random
+import sqlite3
+import threading
+import time
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
-from collections import Counter
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from itertools import islice
+from openpyxl import load_workbook
+from bisect import bisect_right
 
 app = Flask(__name__)
 
 # Config
 RESULTS_FILE = 'lottery_results.xlsx'
 RESULTS_FILE_BULK = 'lottery_results_bulk.xlsx'
-TICKET_START = 10001
-TICKET_END = 20000  # inclusive
+JOURNAL_FILE = 'lottery_results.journal'  # append-only, one JSON line per drawn winner
+SQLITE_FILE = 'lottery_results.sqlite3'
+SESSION_LOG_FILE = 'lottery_sessions.jsonl'  # audit trail: seed + starting state of each session, then every draw
+# Tickets actually sold (and not voided), as run-length ranges; written by --import-sales. When present,
+# only these tickets (within TICKET_START..TICKET_END) can be drawn
+ELIGIBILITY_FILE = 'eligible_tickets.npz'
+SALES_CHUNK_ROWS = 200_000  # sales file rows parsed at a time by --import-sales
+SALES_STATUS_COLUMN = 'Status'
+VOID_STATUSES = {'void', 'voided', 'cancelled', 'canceled'}
+# 'excel': workbooks + JOURNAL_FILE; 'sqlite': SQLITE_FILE (workbooks become exports/imports only)
+STORAGE_BACKEND = os.environ.get('LOTTERY_STORAGE', 'excel')
+# Several worker processes serving one draw, under a pre-fork server whose workers live across requests:
+#   LOTTERY_STORAGE=sqlite LOTTERY_SHARED_STATE=1 gunicorn -w 4 -k gthread --threads 8 main_code_deep_11:app
+# (each worker runs its own state watcher and Excel export thread, so per-request forking servers won't do)
+SHARED_STATE = os.environ.get('LOTTERY_SHARED_STATE') == '1'
+STATE_POLL_INTERVAL = 0.5  # seconds between checks for other workers' commits in SHARED_STATE mode
+TICKET_START = int(os.environ.get('LOTTERY_TICKET_START', 10001))
+TICKET_END = int(os.environ.get('LOTTERY_TICKET_END', 20000))  # inclusive; the pool stores 8 bytes per ticket
+TICKET_DIGITS = int(os.environ.get('LOTTERY_TICKET_DIGITS', 5))  # zero-padded width of displayed tickets
+TICKET_WIDTH = max(TICKET_DIGITS, len(str(TICKET_END)))  # so every ticket in range pads to the same width
 TOTAL_WINNERS = 137  # total number of winning tickets to be selected
+STREAM_QUEUE_SIZE = 64  # events buffered per /api/stream client before it is dropped as too slow
+STREAM_KEEPALIVE = 15  # seconds between keep-alive comments on an idle /api/stream
+LONG_POLL_TIMEOUT = 25  # default / maximum seconds a /api/results/wait request stays parked
+RESULTS_PAGE_SIZE = 10  # default rows per page of /api/results?page= (capped at RESULTS_MAX_PAGE_SIZE)
+RESULTS_MAX_PAGE_SIZE = 500
+# Every session draws from a recorded seed: LOTTERY_SEED if set, else a fresh random one
+# LOTTERY_SCHEDULE=1: fix every remaining draw at initialization from that seed
+PRECOMPUTE_SCHEDULE = os.environ.get('LOTTERY_SCHEDULE') == '1'
+# Bulk draw regions drawn in parallel by this many workers (0: one after another in the request thread)
+BULK_WORKERS = int(os.environ.get('LOTTERY_BULK_WORKERS', '0'))
+BULK_EXECUTOR = os.environ.get('LOTTERY_BULK_EXECUTOR', 'thread')  # 'thread' or 'process'
 
 # Prize master counts (sum must equal TOTAL_WINNERS)
 # 7 prizes total. Adjust counts if you need different distribution.
@@ -62,89 +105,779 @@ REGIONS_BULK = [
 ]
 
 
+UNKNOWN_REGION = ("Unknown", "#999999")
+UNKNOWN_REGION_ID = -1
+
+
+def compile_region_index(regions):
+    """Compile REGIONS into a sorted, non-overlapping interval index.
+       Returns (starts, ends, region_ids) where region_ids[i] indexes into `regions`.
+       Overlapping ranges resolve to the region listed first, same as the old linear scan.
+    """
+    claimed = []  # sorted, non-overlapping (start, end, region_id)
+    for region_id, (_, ranges, _) in enumerate(regions):
+        for start, end in ranges:
+            # carve out the parts of [start, end] not already claimed by an earlier region
+            pieces = []
+            cursor = start
+            for c_start, c_end, _ in claimed:
+                if c_end < cursor or c_start > end:
+                    continue
+                if c_start > cursor:
+                    pieces.append((cursor, c_start - 1, region_id))
+                cursor = max(cursor, c_end + 1)
+            if cursor <= end:
+                pieces.append((cursor, end, region_id))
+            claimed = sorted(claimed + pieces)
+    starts = [c[0] for c in claimed]
+    ends = [c[1] for c in claimed]
+    region_ids = [c[2] for c in claimed]
+    return starts, ends, region_ids
+
+
+# Compiled once at startup; get_region()/get_regions() bisect over the range starts
+_REGION_STARTS, _REGION_ENDS, _REGION_IDS = compile_region_index(REGIONS)
+_REGION_STARTS_NP = np.asarray(_REGION_STARTS, dtype=np.int64)
+_REGION_ENDS_NP = np.asarray(_REGION_ENDS, dtype=np.int64)
+_REGION_IDS_NP = np.asarray(_REGION_IDS, dtype=np.int16)
+REGION_ID_BY_NAME = {name: region_id for region_id, (name, _, _) in enumerate(REGIONS)}
+# REGIONS_BULK as arrays: quota per entry, and the entry each region id draws for (indexed by region id;
+# len(REGIONS_BULK) for "not in the bulk draw", and UNKNOWN_REGION_ID == -1 lands on the last slot)
+BULK_QUOTAS = np.asarray([count for _, count, _ in REGIONS_BULK], dtype=np.int64)
+BULK_ENTRY_BY_REGION = np.full(len(REGIONS) + 1, len(REGIONS_BULK), dtype=np.int64)
+for _entry, (_name, _, _) in enumerate(REGIONS_BULK):
+    BULK_ENTRY_BY_REGION[REGION_ID_BY_NAME.get(_name, UNKNOWN_REGION_ID)] = _entry
+# Ticket ranges each REGIONS_BULK entry draws from, ascending (from the compiled, overlap-free index)
+BULK_RANGES = [[] for _ in REGIONS_BULK]
+for _first, _last, _region_id in zip(_REGION_STARTS, _REGION_ENDS, _REGION_IDS):
+    if BULK_ENTRY_BY_REGION[_region_id] < len(REGIONS_BULK):
+        BULK_RANGES[BULK_ENTRY_BY_REGION[_region_id]].append((_first, _last))
+
+
+def get_region_id(ticket_number):
+    """Return the index into REGIONS for given ticket, or UNKNOWN_REGION_ID."""
+    i = bisect_right(_REGION_STARTS, ticket_number) - 1
+    if i >= 0 and ticket_number <= _REGION_ENDS[i]:
+        return _REGION_IDS[i]
+    return UNKNOWN_REGION_ID
+
+
 def get_region(ticket_number):
     """Return (region_name, color) for given ticket (handles multiple ranges per region)."""
-    for name, ranges, color in REGIONS:
-        for start, end in ranges:
-            if start <= ticket_number <= end:
-                return name, color
-    return "Unknown", "#999999"
+    region_id = get_region_id(ticket_number)
+    if region_id == UNKNOWN_REGION_ID:
+        return UNKNOWN_REGION
+    name, _, color = REGIONS[region_id]
+    return name, color
+
+
+def get_regions(tickets):
+    """Vectorized get_region_id: return an int16 array of REGIONS indices (UNKNOWN_REGION_ID if unmapped)."""
+    tickets = np.asarray(tickets, dtype=np.int64)
+    idx = np.searchsorted(_REGION_STARTS_NP, tickets, side='right') - 1
+    safe_idx = np.clip(idx, 0, None)
+    found = (idx >= 0) & (tickets <= _REGION_ENDS_NP[safe_idx])
+    return np.where(found, _REGION_IDS_NP[safe_idx], UNKNOWN_REGION_ID).astype(np.int16)
+
+
+class TicketPool:
+    """Set of tickets still available to draw, out of a fixed universe of possible tickets: the dense
+       span [base, base + span), or a sorted `universe` array (e.g. an eligibility registry).
+       Typed arrays: the remaining tickets (uint32 where they fit) in the first `len` slots, plus a
+       position index (int32, -1 once gone) with one slot per universe ticket -- 8 bytes per ticket.
+       Membership and removal are O(1) for a dense span (O(log n) for a universe array); removal moves
+       the last live slot into the hole and a random pick is one partial Fisher-Yates step.
+    """
+
+    def __init__(self, tickets=(), base=None, span=None, universe=None):
+        if not isinstance(tickets, np.ndarray):
+            tickets = np.fromiter(tickets, dtype=np.int64)
+        self._universe = universe
+        if universe is not None:
+            base, span = 0, len(universe)
+            slots = np.searchsorted(universe, tickets)
+        else:
+            if base is None:
+                base = int(tickets.min()) if len(tickets) else 0
+                span = int(tickets.max()) - base + 1 if len(tickets) else 0
+            slots = np.asarray(tickets, dtype=np.int64) - base
+        self.base = base
+        fits_uint32 = not len(tickets) or int(tickets.max()) < 2 ** 32
+        self._tickets = np.asarray(tickets, dtype=np.uint32 if fits_uint32 else np.int64)
+        self._size = len(tickets)
+        self._pos = np.full(span, -1, dtype=np.int32)
+        self._pos[slots] = np.arange(len(tickets), dtype=np.int32)
+
+    def __len__(self):
+        return self._size
+
+    def _slot(self, ticket):
+        """Position-index slot of ticket, or -1 if it is outside the universe."""
+        if self._universe is not None:
+            i = int(np.searchsorted(self._universe, ticket))
+            return i if i < len(self._universe) and self._universe[i] == ticket else -1
+        offset = ticket - self.base
+        return offset if 0 <= offset < len(self._pos) else -1
+
+    def __contains__(self, ticket):
+        slot = self._slot(ticket)
+        return slot >= 0 and self._pos[slot] >= 0
+
+    def _slot_range(self, first, last):
+        """Slots [lo, hi) of the position index covering tickets [first, last]."""
+        if self._universe is not None:
+            lo = int(np.searchsorted(self._universe, first, side='left'))
+            hi = int(np.searchsorted(self._universe, last, side='right'))
+        else:
+            lo, hi = max(first - self.base, 0), min(last - self.base + 1, len(self._pos))
+        return lo, max(lo, hi)
+
+    def count_between(self, first, last):
+        """Number of remaining tickets in [first, last]."""
+        lo, hi = self._slot_range(first, last)
+        return int(np.count_nonzero(self._pos[lo:hi] >= 0))
+
+    def segment(self, first, last):
+        """The position index over tickets [first, last] plus what its slots stand for (the first slot's
+           ticket, or the universe slice), as views: cheap to hand to a worker. See segment_tickets().
+        """
+        lo, hi = self._slot_range(first, last)
+        labels = self._universe[lo:hi] if self._universe is not None else self.base + lo
+        return self._pos[lo:hi], labels
+
+    def copy(self):
+        pool = TicketPool.__new__(TicketPool)
+        pool.base, pool._size, pool._universe = self.base, self._size, self._universe
+        pool._tickets, pool._pos = self._tickets.copy(), self._pos.copy()
+        return pool
+
+    def _remove_at(self, i, ticket):
+        self._size -= 1
+        last = int(self._tickets[self._size])
+        self._tickets[i] = last
+        self._pos[self._slot(last)] = i
+        self._pos[self._slot(ticket)] = -1
+
+    def discard(self, ticket):
+        """Remove ticket if present. Returns True if it was removed."""
+        slot = self._slot(ticket)
+        if slot < 0 or self._pos[slot] < 0:
+            return False
+        self._remove_at(self._pos[slot], ticket)
+        return True
+
+    def pop_random(self, rng=random):
+        """Remove and return a uniformly random ticket, or None if the pool is empty."""
+        if not self._size:
+            return None
+        i = rng.randrange(self._size)
+        ticket = int(self._tickets[i])
+        self._remove_at(i, ticket)
+        return ticket
+
+
+class RegionalTicketPool:
+    """TicketPool that also keeps a live ticket count per region (REGIONS index), so the bulk draw can
+       check regional quotas without scanning the pool.
+    """
+
+    def __init__(self, tickets=(), base=None, span=None, universe=None):
+        self._all = TicketPool(tickets, base, span, universe)
+        # slot 0 counts UNKNOWN_REGION_ID, slot region_id + 1 the others; counted per region range
+        # straight off the position index, so no per-ticket region array is ever built
+        self._region_counts = np.zeros(len(REGIONS) + 1, dtype=np.int64)
+        for first, last, region_id in zip(_REGION_STARTS, _REGION_ENDS, _REGION_IDS):
+            self._region_counts[region_id + 1] += self._all.count_between(first, last)
+        self._region_counts[0] = len(self._all) - self._region_counts[1:].sum()
+
+    def __len__(self):
+        return len(self._all)
+
+    def __contains__(self, ticket):
+        return ticket in self._all
+
+    def segment(self, first, last):
+        return self._all.segment(first, last)
+
+    def copy(self):
+        pool = RegionalTicketPool.__new__(RegionalTicketPool)
+        pool._all, pool._region_counts = self._all.copy(), self._region_counts.copy()
+        return pool
+
+    def region_size(self, region_id):
+        return int(self._region_counts[region_id + 1])
+
+    def discard(self, ticket):
+        """Remove ticket if present. Returns True if it was removed."""
+        if not self._all.discard(ticket):
+            return False
+        self._region_counts[get_region_id(ticket) + 1] -= 1
+        return True
+
+    def pop_random(self, rng=random):
+        """Remove and return a uniformly random ticket from the whole pool, or None if empty."""
+        ticket = self._all.pop_random(rng)
+        if ticket is not None:
+            self._region_counts[get_region_id(ticket) + 1] -= 1
+        return ticket
+
+
+class TicketRanges:
+    """Set of tickets as sorted, disjoint, non-adjacent inclusive runs [starts[i], ends[i]].
+       Memory grows with the number of runs, not of tickets: a registry of millions of mostly
+       consecutive tickets takes kilobytes.
+    """
+
+    def __init__(self, starts=(), ends=()):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+
+    @classmethod
+    def from_tickets(cls, tickets):
+        tickets = np.unique(np.asarray(tickets, dtype=np.int64))
+        if not len(tickets):
+            return cls()
+        breaks = np.flatnonzero(np.diff(tickets) != 1) + 1
+        return cls(tickets[np.r_[0, breaks]], tickets[np.r_[breaks - 1, len(tickets) - 1]])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['starts'], data['ends'])
+
+    def save(self, path):
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            np.savez_compressed(f, starts=self.starts, ends=self.ends)
+        os.replace(tmp_file, path)
+
+    def __len__(self):
+        return int((self.ends - self.starts + 1).sum())
+
+    def __contains__(self, ticket):
+        i = int(np.searchsorted(self.starts, ticket, side='right')) - 1
+        return i >= 0 and ticket <= self.ends[i]
+
+    def digest(self):
+        return hashlib.sha256(self.starts.tobytes() + self.ends.tobytes()).hexdigest()
+
+    def _combine(self, other, keep):
+        """Runs covering the tickets for which keep(in self, in other) holds: a sweep over all run boundaries."""
+        self_ones, self_zeros = np.ones(len(self.starts), np.int64), np.zeros(len(self.starts), np.int64)
+        other_ones, other_zeros = np.ones(len(other.starts), np.int64), np.zeros(len(other.starts), np.int64)
+        points = np.concatenate([self.starts, self.ends + 1, other.starts, other.ends + 1])
+        if not len(points):
+            return TicketRanges()
+        in_self = np.concatenate([self_ones, -self_ones, other_zeros, other_zeros])
+        in_other = np.concatenate([self_zeros, self_zeros, other_ones, -other_ones])
+        order = np.argsort(points, kind='stable')
+        points, in_self, in_other = points[order], np.cumsum(in_self[order]), np.cumsum(in_other[order])
+        last = np.r_[points[1:] != points[:-1], True]  # coverage after all events at a point
+        points, in_self, in_other = points[last], in_self[last], in_other[last]
+        covered = keep(in_self[:-1] > 0, in_other[:-1] > 0)  # segment [points[i], points[i + 1] - 1]
+        starts, ends = points[:-1][covered], points[1:][covered] - 1
+        if not len(starts):
+            return TicketRanges()
+        # merge segments that touch
+        touching = starts[1:] == ends[:-1] + 1
+        return TicketRanges(starts[np.r_[True, ~touching]], ends[np.r_[~touching, True]])
+
+    def __or__(self, other):
+        return self._combine(other, np.logical_or)
+
+    def __and__(self, other):
+        return self._combine(other, np.logical_and)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def to_array(self):
+        """All tickets, ascending (int64 array)."""
+        lengths = self.ends - self.starts + 1
+        run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(self.starts, lengths) + (np.arange(lengths.sum()) - run_offsets)
+
+
+def build_ticket_pool(exclude=(), start=None, end=None, eligible=None):
+    """RegionalTicketPool of every ticket in [start, end] (default TICKET_START..TICKET_END) except
+       `exclude`, in ascending order; only tickets in `eligible` (TicketRanges) if given.
+       Built with array operations: no Python loop over the range.
+    """
+    start = TICKET_START if start is None else start
+    end = TICKET_END if end is None else end
+    if eligible is None:
+        excluded = np.fromiter((t - start for t in exclude if start <= t <= end), dtype=np.int64)
+        tickets = np.delete(np.arange(start, end + 1, dtype=np.uint32), excluded)
+        return RegionalTicketPool(tickets, base=start, span=end - start + 1)
+    universe = (eligible & TicketRanges([start], [end])).to_array()
+    excluded = np.fromiter(exclude, dtype=np.int64)
+    slots = np.searchsorted(universe, excluded)
+    found = slots < len(universe)
+    found[found] = universe[slots[found]] == excluded[found]
+    return RegionalTicketPool(np.delete(universe, slots[found]), universe=universe)
+
+
+def format_ticket(ticket):
+    return f"{ticket:0{TICKET_WIDTH}d}"
+
+
+# Prize index order for PrizeInventory count vectors
+PRIZE_NAMES = list(PRIZE_MASTER)
+PRIZE_INDEX = {name: i for i, name in enumerate(PRIZE_NAMES)}
+# Prizes eligible for draws 1..26 ('Wall Clock' is held back for later draws)
+EARLY_DRAW_MASK = [not name.lower().startswith('wall clock') for name in PRIZE_NAMES]
+
+
+class PrizeInventory:
+    """Remaining prize units as one count per PRIZE_NAMES entry.
+       Sampling is weighted by remaining count, so it matches drawing one unit uniformly
+       from the expanded list, but costs O(number of prize kinds) regardless of inventory size.
+    """
+
+    def __init__(self, counts=None):
+        counts = counts if counts is not None else {name: meta['count'] for name, meta in PRIZE_MASTER.items()}
+        self.counts = [int(counts.get(name, 0)) for name in PRIZE_NAMES]
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def take(self, prize_name):
+        """Decrement one unit of prize_name if any remain. Returns True if a unit was taken."""
+        i = PRIZE_INDEX.get(prize_name)
+        if i is None or self.counts[i] <= 0:
+            return False
+        self.counts[i] -= 1
+        return True
+
+    def sample(self, mask=None, rng=random):
+        """Pick a prize index with probability proportional to its remaining (masked) count, or None."""
+        weights = self.counts if mask is None else [c if allowed else 0 for c, allowed in zip(self.counts, mask)]
+        total = sum(weights)
+        if total <= 0:
+            return None
+        r = rng.randrange(total)
+        for i, w in enumerate(weights):
+            if r < w:
+                return i
+            r -= w
+
+
+class DrawSchedule:
+    """Winners of the remaining draws, fixed up front: the live draws of the session with this `seed`,
+       run ahead on a copy of the pool and inventory (see pick_winner), up to the 26th draw, then the
+       bulk draw's tickets (see pick_bulk_wall_clocks) unless `bulk` is False (already drawn).
+       Draw number k (0-based, i.e. total_drawn before the draw) takes entry k - start.
+       `digest` seals the whole schedule, bulk picks included, and can be published before the first draw.
+    """
+
+    def __init__(self, seed, pool, inventory, start, bulk=True):
+        self.seed = seed
+        self.start = start
+        self.tickets = []
+        self.prizes = []
+        self.bulk = []
+        pool = pool.copy()
+        inventory = PrizeInventory(dict(zip(PRIZE_NAMES, inventory.counts)))
+        for k in range(start, 26):
+            pick = pick_winner(pool, inventory, k, draw_rng(seed, k))
+            if pick is None:
+                break
+            self.tickets.append(pick[0])
+            self.prizes.append(pick[1])
+        if bulk and start + len(self.tickets) >= 26:
+            _, tickets, _ = pick_bulk_wall_clocks(pool, draw_seed_sequence(seed, 'bulk'))
+            self.bulk = tickets.tolist()
+        sealed = json.dumps({'start': start, 'draws': list(zip(self.tickets, self.prizes)), 'bulk': self.bulk},
+                            separators=(',', ':'))
+        self.digest = hashlib.sha256(sealed.encode()).hexdigest()
+
+    def __len__(self):
+        return len(self.tickets)
+
+    def entry(self, draw_number):
+        """(ticket, prize_name) scheduled for draw_number, or None outside the schedule."""
+        j = draw_number - self.start
+        if 0 <= j < len(self.tickets):
+            return self.tickets[j], self.prizes[j]
+        return None
 
 
 # Global runtime draw state
 current_draw = {
     'initialized': False,
     'results': [],  # list of dict results loaded from file + drawn during this session
-    'available_tickets': [],  # tickets that remain possible to draw
-    'available_prizes': [],  # list of prize names (one entry per remaining prize unit)
-    'prize_counts_remaining': {},  # counts remaining by prize name
+    'available_tickets': RegionalTicketPool(),  # tickets that remain possible to draw, counted by region
+    'available_prizes': PrizeInventory({}),  # remaining prize units, one count per prize
     'total_drawn': 0,
     'draw_id': None,
+    'bulk_tickets': set(),  # tickets won in the bulk draw (exported to RESULTS_FILE_BULK, not RESULTS_FILE)
+    'version': 0,  # bumped on every commit; keys this process's caches and ETags
+    # Where clients stand, given to them as `version` and passed back as ?since= (see results_cursor):
+    # 'version' itself, or in SHARED_STATE mode the winners.id of the last row, the same in every worker
+    'cursor': 0,
+    'cursor_tag': '',  # what 'cursor' is counted against: cursors carrying another tag must reload
+    'base_cursor': 0,  # cursor of the last full reset (initialize/upload); older cursors must reload
+    'row_cursors': [],  # cursor at which each entry of 'results' was committed
+    'results_json': [],  # each entry of 'results' encoded to JSON once, at commit
+    'ticket_index': {},  # ticket_number -> position in 'results'
+    'region_index': {},  # region name -> ascending positions in 'results'
+    'prize_index': {},  # prize name -> ascending positions in 'results'
+    'region_table': [],  # distinct (region, region_color) pairs, first seen first: ids for ?format=columnar
+    'prize_table': [],  # distinct (prize_name, prize_image) pairs, likewise
+    'region_codes': [],  # each entry of 'results' as an index into 'region_table'
+    'prize_codes': [],  # each entry of 'results' as an index into 'prize_table'
+    'schedule': None,  # DrawSchedule when PRECOMPUTE_SCHEDULE is on
+    'seed': None,  # recorded seed every draw of this session is derived from (see draw_rng)
+    'eligible': None,  # TicketRanges from ELIGIBILITY_FILE, or None: every ticket in range was sold
 }
 
+# Immutable view of current_draw published after every commit. 'results'/'row_cursors'/'results_json' are
+# only ever appended to (or replaced by a new list), so the first `count` entries never change under a reader;
+# The indexes, tables and codes only gain entries, and positions >= count belong to a later commit.
+DrawSnapshot = namedtuple('DrawSnapshot', 'version cursor cursor_tag base_cursor results row_cursors results_json '
+                                          'ticket_index region_index prize_index '
+                                          'region_table prize_table region_codes prize_codes count stats')
+
+
+class DrawEngine:
+    """Owns current_draw and its synchronization.
+       Every mutation (draw, bulk draw, upload, (re)initialization) runs inside mutation(), so draws are
+       strictly serialized. Readers use `snapshot`, swapped in atomically after each commit, and never
+       wait for the lock (or for an Excel write happening under it).
+       In SHARED_STATE mode mutation() also holds the storage write lock across all worker processes and
+       first replays what the other workers committed, so draws are linearized over the whole deployment.
+       What a mutation announces (publish(), stream events, session log lines) waits for its transaction
+       to commit (see after_commit), so nothing goes out that a rollback would take back.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.lock = threading.RLock()
+        self.committed = threading.Condition()  # notified on every publish()
+        self._depth = 0  # mutation() nesting in the thread holding `lock`
+        self._watcher_pid = None
+        self._pending = None  # after_commit() actions of the open storage transaction, or None if there is none
+        self.snapshot = None
+        self.publish()
+
+    @contextmanager
+    def mutation(self):
+        with self.lock:
+            self._depth += 1
+            try:
+                if self._depth == 1 and SHARED_STATE:
+                    self._pending = []
+                    try:
+                        with storage.write_lock():
+                            if self.state['initialized']:
+                                self._sync()
+                            yield
+                    except BaseException:
+                        # rolled back (or COMMIT failed): the state is ahead of storage, reload it on next use
+                        self.state['initialized'] = False
+                        raise
+                    finally:
+                        pending, self._pending = self._pending, None
+                    for action, args in pending:
+                        action(*args)
+                else:
+                    yield
+            finally:
+                self._depth -= 1
+
+    def after_commit(self, action, *args):
+        """Run action(*args) once the current mutation's storage transaction has committed, in call order;
+           right away if there is no transaction open (not SHARED_STATE, or outside a mutation).
+        """
+        if self._pending is None:
+            action(*args)
+        else:
+            self._pending.append((action, args))
+
+    def refresh(self):
+        """SHARED_STATE mode: pull in what other workers committed. Cheap when nothing changed, and
+           skipped (never waited for) while this process is mid-mutation.
+        """
+        if not SHARED_STATE or not self.state['initialized']:
+            return
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            if storage.changed():
+                self._sync()
+        finally:
+            self.lock.release()
+
+    def _sync(self):
+        reset, rows = storage.changes_since()
+        if reset:
+            initialize_draw()
+            return
+        if not rows:
+            return
+        s = self.state
+        for result, bulk, _ in rows:
+            s['available_tickets'].discard(result['ticket_number'])
+            if bulk:
+                # the bulk draw hands out PRIZE_MASTER_BULK, not the main inventory (see draw_bulk_wall_clocks)
+                s['bulk_tickets'].add(result['ticket_number'])
+            else:
+                s['available_prizes'].take(result['prize_name'])
+                s['total_drawn'] += 1
+        if s['schedule'] is not None:
+            # it was run ahead from a pool without these winners (and another worker's seed drew them)
+            print("⚠️ Other workers have drawn; dropping the precomputed schedule and drawing live from here")
+            s['schedule'] = None
+        commit_results([result for result, _, _ in rows], [row_id for _, _, row_id in rows])
+        for result, bulk, _ in rows:
+            if not bulk:
+                publish_event('winner', {'winner': result})
+        bulk_rows = [result for result, bulk, _ in rows if bulk]
+        if bulk_rows:
+            publish_event('bulk', {'results': bulk_rows})
+        print(f"Synced {len(rows)} results committed by other workers")
+
+    def _watch(self):
+        while True:
+            time.sleep(STATE_POLL_INTERVAL)
+            self.refresh()
+
+    def publish(self):
+        """Publish the current state to readers. Call with `lock` held, after the state is consistent;
+           readers get it once the storage transaction commits (see after_commit).
+        """
+        s = self.state
+        snapshot = DrawSnapshot(s['version'], s['cursor'], s['cursor_tag'], s['base_cursor'], s['results'],
+                                s['row_cursors'], s['results_json'], s['ticket_index'], s['region_index'], s['prize_index'],
+                                s['region_table'], s['prize_table'], s['region_codes'], s['prize_codes'],
+                                len(s['results']), draw_stats(s))
+        self.after_commit(self._swap, snapshot)
+
+    def _swap(self, snapshot):
+        self.snapshot = snapshot
+        with self.committed:
+            self.committed.notify_all()
+
+    def wait_for_commit(self, cursor, timeout):
+        """Block until the published state moves past `cursor` (see results_cursor; or `timeout` seconds pass);
+           return the snapshot current at that point.
+        """
+        with self.committed:
+            self.committed.wait_for(lambda: results_cursor(self.snapshot) != cursor, timeout)
+        return self.snapshot
+
+    def ensure_initialized(self):
+        if not self.state['initialized']:
+            with self.lock:
+                if not self.state['initialized']:
+                    initialize_draw()
+        if SHARED_STATE and self._watcher_pid != os.getpid():
+            # one watcher per worker process (threads do not survive fork), so live streams
+            # hear about draws made through other workers
+            self._watcher_pid = os.getpid()
+            threading.Thread(target=self._watch, name='state-watcher', daemon=True).start()
+
+
+def serialized(func):
+    """Run func inside engine.mutation() (re-entrant, so serialized functions may call each other)."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with engine.mutation():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def draw_stats(state=None):
+    """Counters shown in the stats bar; shared by the API responses and the live stream."""
+    state = state if state is not None else current_draw
+    return {
+        "total_prizes": TOTAL_WINNERS,
+        "drawn_count": state['total_drawn'],
+        "remaining_count": max(0, TOTAL_WINNERS - state['total_drawn']),
+    }
+
+
+engine = DrawEngine(current_draw)
+
+
+TICKET_COLUMNS = ['Ticket ID', 'Ticket Number', 'Ticket']  # tried in this order
+
+
+def _numeric_column(df, col):
+    """Column coerced to float (NaN where missing or not a number)."""
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    values = df[col]
+    if values.dtype == object:
+        values = values.astype(str).str.strip()
+    return pd.to_numeric(values, errors='coerce')
+
+
+def ticket_ids_from_frame(df):
+    """Resolve the ticket column(s) once and return a float Series of ticket ids (NaN if none usable)."""
+    ticket_ids = pd.Series(np.nan, index=df.index)
+    for col in TICKET_COLUMNS:
+        if col in df.columns:
+            ticket_ids = ticket_ids.fillna(_numeric_column(df, col))
+            if ticket_ids.notna().all():
+                break  # later fallback columns are never consulted
+    return ticket_ids
 
-def build_prize_list_from_counts(counts):
-    """Return a list of prize dicts {'name','image'} repeated by count."""
-    prize_list = []
-    for name, meta in counts.items():
-        for _ in range(meta['count']):
-            prize_list.append({'name': name, 'image': meta.get('image', '/static/prizes/default.jpg')})
-    return prize_list
+
+def results_from_frame(df, default_image, source):
+    """Convert a results sheet into result dicts, column-wise.
+       Rows without a usable ticket id or with a non-numeric rank are rejected and reported once.
+    """
+    ticket_ids = ticket_ids_from_frame(df)
+    ranks = _numeric_column(df, 'Rank')
+    bad_rank = ranks.isna() & df['Rank'].notna() if 'Rank' in df.columns else pd.Series(False, index=df.index)
+    ok = ticket_ids.notna() & ~bad_rank
+
+    rejected = df.index[~ok]
+    if len(rejected):
+        print(f"Warning: skipped {len(rejected)} rows from {source} without a valid ticket/rank "
+              f"(rows {', '.join(str(i) for i in rejected[:10])}{', ...' if len(rejected) > 10 else ''})")
+
+    df = df[ok]
+    tickets = ticket_ids[ok].astype(np.int64)
+    region_ids = get_regions(tickets.to_numpy())
+    region_names = np.array([name for name, _, _ in REGIONS] + [UNKNOWN_REGION[0]], dtype=object)
+    region_colors = np.array([color for _, _, color in REGIONS] + [UNKNOWN_REGION[1]], dtype=object)
+
+    if 'Prize Name' in df.columns:
+        # only a handful of distinct prize names: clean the uniques, then broadcast back
+        codes, uniques = pd.factorize(df['Prize Name'], use_na_sentinel=False)
+        cleaned = np.array(['' if pd.isna(u) else str(u).strip() for u in uniques] or [''], dtype=object)
+        prize_names = pd.Series(cleaned[codes], index=df.index)
+    else:
+        prize_names = pd.Series('', index=df.index)
+    regions = pd.Series(region_names[region_ids], index=df.index)
+    if 'Region' in df.columns:
+        regions = df['Region'].where(df['Region'].notna(), regions)
+    images = prize_names.map({name: meta['image'] for name, meta in PRIZE_MASTER.items()}).fillna(default_image)
+    if 'Prize Image' in df.columns:
+        stored = df['Prize Image']
+        images = stored.where(stored.notna() & (stored.astype(str) != ''), images)
+
+    ticket_list = tickets.tolist()
+    columns = {
+        'rank': ranks[ok].fillna(0).astype(np.int64).tolist(),
+        'ticket_number': ticket_list,
+        'ticket': [format_ticket(t) for t in ticket_list],
+        'region': regions.tolist(),
+        'region_color': region_colors[region_ids].tolist(),
+        'prize_name': prize_names.tolist(),
+        'prize_image': images.tolist(),
+    }
+    # zip plain lists into dicts; DataFrame.to_dict('records') boxes every cell and is far slower
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+# ---------- Eligibility registry (imported sales files) ----------
+
+def _sales_chunks(path):
+    """DataFrames of at most SALES_CHUNK_ROWS rows read from a CSV or Excel sales export."""
+    if path.lower().endswith('.csv'):
+        wanted = set(TICKET_COLUMNS) | {SALES_STATUS_COLUMN}
+        yield from pd.read_csv(path, chunksize=SALES_CHUNK_ROWS, dtype=str, usecols=lambda col: col in wanted)
+        return
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = ['' if h is None else str(h).strip() for h in next(rows, ())]
+        while True:
+            batch = list(islice(rows, SALES_CHUNK_ROWS))
+            if not batch:
+                break
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def import_sales_file(path, out=ELIGIBILITY_FILE):
+    """Build the eligibility registry from a branch sales export: every ticket sold, minus every ticket
+       with a void row (SALES_STATUS_COLUMN in VOID_STATUSES) anywhere in the file.
+       Each chunk is folded into run-length ranges before the next is read, so memory is bounded by
+       the chunk size and the number of runs, not the number of rows.
+    """
+    sold, voided = TicketRanges(), TicketRanges()
+    rows = 0
+    for chunk in _sales_chunks(path):
+        rows += len(chunk)
+        tickets = ticket_ids_from_frame(chunk)
+        if SALES_STATUS_COLUMN in chunk.columns:
+            void = chunk[SALES_STATUS_COLUMN].astype(str).str.strip().str.lower().isin(VOID_STATUSES)
+        else:
+            void = pd.Series(False, index=chunk.index)
+        usable = tickets.notna()
+        sold = sold | TicketRanges.from_tickets(tickets[usable & ~void])
+        voided = voided | TicketRanges.from_tickets(tickets[usable & void])
+    eligible = sold - voided
+    eligible.save(out)
+    print(f"Imported {rows} sales rows from {path}: {len(eligible)} eligible tickets in {len(eligible.starts)} "
+          f"ranges ({len(voided)} voided), saved to {out}")
+    return eligible
+
+
+def load_eligibility(path=ELIGIBILITY_FILE):
+    """The eligibility registry, or None when there is none (every ticket in range counts as sold)."""
+    if not os.path.exists(path):
+        return None
+    eligible = TicketRanges.load(path)
+    print(f"Eligibility registry {path}: {len(eligible)} tickets in {len(eligible.starts)} ranges")
+    return eligible
+
+
+# Parsed workbooks, keyed on path and validated against (mtime, size): a workbook is only re-parsed
+# after something rewrote it. The app's own writes drop their entry via forget_workbook().
+_workbook_cache = {}
+_workbook_cache_lock = threading.Lock()
+
+
+def _workbook_entry(path):
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    with _workbook_cache_lock:
+        entry = _workbook_cache.get(path)
+    if entry is None or entry['key'] != key:
+        entry = {'key': key, 'frame': pd.read_excel(path), 'tickets': None}
+        with _workbook_cache_lock:
+            _workbook_cache[path] = entry
+    return entry
+
+
+def read_workbook(path):
+    """pd.read_excel(path), served from the parse cache while the file is unchanged. Do not mutate the frame."""
+    return _workbook_entry(path)['frame']
 
 
-def load_results_from_excel():
-    """Load results from Excel file and return them as a list."""
+def workbook_tickets(path):
+    """Ticket ids found in a results workbook (frozenset), cached like read_workbook()."""
+    entry = _workbook_entry(path)
+    if entry['tickets'] is None:
+        entry['tickets'] = frozenset(ticket_ids_from_frame(entry['frame']).dropna().astype(np.int64).tolist())
+    return entry['tickets']
+
+
+def forget_workbook(path):
+    with _workbook_cache_lock:
+        _workbook_cache.pop(path, None)
+
+
+def load_results_from_excel(bulk_tickets=None):
+    """Load results from Excel file and return them as a list.
+       Tickets read from RESULTS_FILE_BULK are also added to `bulk_tickets` if given.
+    """
     results = []
     bulk_results_count = 0
 
     # Load results from main lottery results file
     if os.path.exists(RESULTS_FILE):
         try:
-            df = pd.read_excel(RESULTS_FILE)
+            df = read_workbook(RESULTS_FILE)
             # Expecting columns: Rank, Ticket Number, Ticket ID, Region, Prize Name, Prize Image (optional)
-            for _, row in df.iterrows():
-                try:
-                    # Try different column names for ticket ID
-                    ticket_id = None
-                    for col in ['Ticket ID', 'Ticket Number', 'Ticket']:
-                        if col in row and not pd.isna(row[col]):
-                            try:
-                                ticket_id = int(row[col])
-                                break
-                            except (ValueError, TypeError):
-                                continue
-
-                    if ticket_id is None:
-                        continue
-
-                    prize_name = str(row.get('Prize Name', '')).strip()
-                    region = row.get('Region', None) if 'Region' in row and not pd.isna(row['Region']) else None
-                    prize_image = row.get('Prize Image', None) if 'Prize Image' in row and not pd.isna(
-                        row['Prize Image']) else None
-                    rank = int(row.get('Rank', 0)) if not pd.isna(row.get('Rank', 0)) else 0
-
-                    # Get region info if not available in Excel
-                    region_name, region_color = get_region(ticket_id)
-                    if region:
-                        region_name = region
-
-                    # Use default prize image if not available
-                    if not prize_image:
-                        prize_image = PRIZE_MASTER.get(prize_name, {}).get('image', '/static/prizes/win.jpg')
-
-                    results.append({
-                        'rank': rank,
-                        'ticket_number': ticket_id,
-                        'ticket': f"{ticket_id:05d}",
-                        'region': region_name,
-                        'region_color': region_color,
-                        'prize_name': prize_name,
-                        'prize_image': prize_image
-                    })
-                except Exception as e:
-                    print(f"Warning: Could not process row {_}: {e}")
-                    continue
-
+            results.extend(results_from_frame(df, '/static/prizes/win.jpg', RESULTS_FILE))
             print(f"Loaded {len(results)} results from {RESULTS_FILE}")
         except Exception as e:
             print(f"Error reading RESULTS_FILE: {e}")
@@ -154,55 +887,13 @@ def load_results_from_excel():
     # Load results from bulk lottery results file
     if os.path.exists(RESULTS_FILE_BULK):
         try:
-            df_bulk = pd.read_excel(RESULTS_FILE_BULK)
-            # Expecting same columns as main results file
-            for _, row in df_bulk.iterrows():
-                try:
-                    # Try different column names for ticket ID
-                    ticket_id = None
-                    for col in ['Ticket ID', 'Ticket Number', 'Ticket']:
-                        if col in row and not pd.isna(row[col]):
-                            try:
-                                ticket_id = int(row[col])
-                                break
-                            except (ValueError, TypeError):
-                                continue
-
-                    if ticket_id is None:
-                        continue
-
-                    prize_name = str(row.get('Prize Name', '')).strip()
-                    region = row.get('Region', None) if 'Region' in row and not pd.isna(row['Region']) else None
-                    prize_image = row.get('Prize Image', None) if 'Prize Image' in row and not pd.isna(
-                        row['Prize Image']) else None
-                    rank = int(row.get('Rank', 0)) if not pd.isna(row.get('Rank', 0)) else 0
-
-                    # Get region info if not available in Excel
-                    region_name, region_color = get_region(ticket_id)
-                    if region:
-                        region_name = region
-
-                    # Use default prize image if not available - FIXED
-                    if not prize_image:
-                        # For bulk draws, all prizes are Wall Clocks
-                        prize_image = PRIZE_MASTER_BULK['Wall Clock']['image']
-
-                    results.append({
-                        'rank': rank,
-                        'ticket_number': ticket_id,
-                        'ticket': f"{ticket_id:05d}",
-                        'region': region_name,
-                        'region_color': region_color,
-                        'prize_name': prize_name,
-                        'prize_image': prize_image
-                    })
-                    bulk_results_count += 1
-
-                except Exception as e:
-                    print(f"Warning: Could not process bulk row {_}: {e}")
-                    continue
-
-            # FIXED: Use the actual count instead of trying to filter by string
+            df_bulk = read_workbook(RESULTS_FILE_BULK)
+            # Expecting same columns as main results file; all bulk prizes are Wall Clocks
+            bulk_results = results_from_frame(df_bulk, PRIZE_MASTER_BULK['Wall Clock']['image'], RESULTS_FILE_BULK)
+            results.extend(bulk_results)
+            bulk_results_count = len(bulk_results)
+            if bulk_tickets is not None:
+                bulk_tickets.update(r['ticket_number'] for r in bulk_results)
             print(f"Loaded {bulk_results_count} results from {RESULTS_FILE_BULK}")
         except Exception as e:
             print(f"Error reading RESULTS_FILE_BULK: {e}")
@@ -216,6 +907,224 @@ def load_results_from_excel():
     return results
 
 
+def append_to_journal(results, bulk=False):
+    """Append one JSON line per result to JOURNAL_FILE and fsync before returning.
+       Cost is constant per draw regardless of how many winners already exist.
+    """
+    lines = ''.join(
+        json.dumps({'draw_id': current_draw['draw_id'], 'bulk': bulk, 'result': r}, ensure_ascii=False) + '\n'
+        for r in results)
+    with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_journal(results, bulk_tickets=None):
+    """Merge journalled winners that are missing from `results` (e.g. the Excel export
+       had not caught up before a crash). Returns the number of rows recovered.
+       Tickets journalled by a bulk draw are also added to `bulk_tickets` if given.
+    """
+    if not os.path.exists(JOURNAL_FILE):
+        return 0
+    known = {r['ticket_number'] for r in results}
+    recovered = 0
+    with open(JOURNAL_FILE, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            try:
+                record = json.loads(line)
+                result = record['result']
+            except (ValueError, KeyError):
+                # a torn last line from a crash mid-write is expected; anything else is worth a warning
+                print(f"Warning: skipping unreadable journal line {line_no}")
+                continue
+            if result['ticket_number'] in known:
+                continue
+            known.add(result['ticket_number'])
+            results.append(result)
+            if record.get('bulk') and bulk_tickets is not None:
+                bulk_tickets.add(result['ticket_number'])
+            recovered += 1
+    if recovered:
+        results.sort(key=lambda x: x['rank'])
+    print(f"Recovered {recovered} results from {JOURNAL_FILE}")
+    return recovered
+
+
+def reset_journal():
+    """Drop the journal once its contents have been superseded by a synchronous workbook write."""
+    if os.path.exists(JOURNAL_FILE):
+        os.remove(JOURNAL_FILE)
+
+
+# ---------- Session log & replay verification ----------
+# SESSION_LOG_FILE gets one line when a session (re)builds its state -- its seed and the state the draws
+# start from -- and one line per committed draw. Every pick is derived from the seed (draw_rng), so
+# verify_session_log() can re-run each draw and check it produced exactly the logged winners.
+# Lines are written once the storage transaction commits. In SHARED_STATE mode they carry a `cursor`
+# (winners.id) so the verifier can put workers' lines back in commit order.
+
+def _append_session_log(record):
+    with open(SESSION_LOG_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def log_session_start(replaced=False):
+    """Record the seed and starting state of the session initialize_draw()/an upload just built.
+       `replaced` marks an upload: storage then holds only the `used` winners.
+    """
+    record = {
+        'draw_id': current_draw['draw_id'],
+        'seed': current_draw['seed'],
+        'tickets': [TICKET_START, TICKET_END],
+        'eligible': current_draw['eligible'].digest() if current_draw['eligible'] is not None else None,
+        'used': sorted(r['ticket_number'] for r in current_draw['results']),
+        'prizes': list(current_draw['available_prizes'].counts),
+        'drawn': current_draw['total_drawn'],
+        'replaced': replaced,
+    }
+    if SHARED_STATE:
+        record['cursor'] = storage.last_id  # the state holds every row up to here
+    engine.after_commit(_append_session_log, record)
+
+
+def log_session_draw(draw, results, row_ids=None):
+    """Record one commit: `draw` is the number of the first draw (total_drawn before it) or 'bulk'.
+       `row_ids` are the rows' winners.id in SHARED_STATE mode.
+    """
+    record = {
+        'draw_id': current_draw['draw_id'],
+        'seed': current_draw['seed'],
+        'draw': draw,
+        'winners': [[r['ticket_number'], r['prize_name']] for r in results],
+    }
+    if SHARED_STATE:
+        record['cursor'] = row_ids[0]
+    engine.after_commit(_append_session_log, record)
+
+
+def _log_order(entry):
+    """Commit order of a (line_no, record) from a SHARED_STATE log: a session starts after the rows up to
+       its cursor, a draw's rows come after the cursor before its own.
+    """
+    record = entry[1]
+    return record['cursor'], 1 if 'used' in record else 0
+
+
+def verify_session_log(path=SESSION_LOG_FILE, eligibility_file=ELIGIBILITY_FILE, stored=None):
+    """Replay every draw in a session log from its seed and compare with the logged winners, then
+       compare each session's replayed winners with the stored results (`stored`, default storage.load()).
+       Sessions that drew from an eligibility registry need that registry (`eligibility_file`).
+       Each session replays on its own pool, which takes other sessions' winners out in log order before
+       the session's next draw, as DrawEngine._sync() does when SHARED_STATE workers draw in turn.
+       Sessions started before the last upload in the log were superseded by it and are only replayed.
+       Returns {draw_id: list of mismatch descriptions} (an empty list means the session verified).
+    """
+    reports = {}
+    registry = None
+    states = {}  # draw_id -> (pool, inventory, [(ticket, prize_name, bulk)] drawn by others since), None if unreplayable
+    sessions = []  # draw_ids in the order they started
+    current = 0  # sessions[current:] are the ones since the last upload, i.e. what storage should hold
+    accounted = {}  # draw_id -> tickets the session started with or drew without a replay to check
+    drawn = {}  # draw_id -> [(line_no, draw, ticket, prize_name)] as replayed
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            try:
+                entries.append((line_no, json.loads(line)))
+            except ValueError:
+                print(f"Warning: skipping unreadable session log line {line_no}")
+    if entries and all('cursor' in record for _, record in entries):
+        # workers append once their own COMMIT is done, so lines can trail a later commit by another worker
+        entries.sort(key=_log_order)
+    for line_no, record in entries:
+        draw_id = record['draw_id']
+        problems = reports.setdefault(draw_id, [])
+        if 'used' in record:
+            # session start: rebuild the state exactly as initialize_draw() / an upload did
+            used = set(record['used'])
+            if record.get('replaced'):
+                current = len(sessions)
+                states.clear()  # every other session reloads before it draws again
+            sessions.append(draw_id)
+            accounted[draw_id] = set(used)
+            states[draw_id] = None
+            start, end = record['tickets']
+            eligible = None
+            if record.get('eligible'):
+                if registry is None and os.path.exists(eligibility_file):
+                    registry = TicketRanges.load(eligibility_file)
+                if registry is None or registry.digest() != record['eligible']:
+                    problems.append(f"line {line_no}: session drew from an eligibility registry "
+                                    f"that {eligibility_file} does not match")
+                    continue
+                eligible = registry
+            states[draw_id] = (build_ticket_pool(used, start, end, eligible),
+                               PrizeInventory(dict(zip(PRIZE_NAMES, record['prizes']))), [])
+            continue
+
+        logged = [tuple(w) for w in record['winners']]
+        draw, seed = record['draw'], record['seed']
+        for other, state in states.items():
+            if other != draw_id and state is not None:
+                state[2].extend((ticket, prize_name, draw == 'bulk') for ticket, prize_name in logged)
+        state = states.get(draw_id)
+        if state is None:
+            problems.append(f"line {line_no}: no session state to replay this draw from")
+            if draw_id in accounted:
+                accounted[draw_id].update(ticket for ticket, _ in logged)
+            continue
+        pool, inventory, synced = state
+        for ticket, prize_name, bulk in synced:
+            pool.discard(ticket)
+            if not bulk:
+                inventory.take(prize_name)
+        synced.clear()
+
+        if draw == 'bulk':
+            _, tickets, _ = pick_bulk_wall_clocks(pool, draw_seed_sequence(seed, 'bulk'))
+            replayed = [(t, 'Wall Clock') for t in tickets.tolist()]
+        else:
+            replayed = []
+            for k in range(draw, draw + len(logged)):
+                pick = pick_winner(pool, inventory, k, draw_rng(seed, k))
+                if pick is None:
+                    break
+                replayed.append(pick)
+        drawn.setdefault(draw_id, []).extend(
+            (line_no, draw, ticket, prize_name) for ticket, prize_name in replayed)
+        if replayed != logged:
+            problems.append(f"line {line_no}: draw {draw} logged {logged[:3]}... but replays to {replayed[:3]}...")
+            # carry on from what was actually drawn, so later draws are still checked
+            for ticket, prize_name in logged:
+                pool.discard(ticket)
+                if draw != 'bulk':
+                    inventory.take(prize_name)
+
+    if stored is None:
+        stored, _ = storage.load()
+    stored_prizes = {r['ticket_number']: r['prize_name'] for r in stored}
+    expected = set()
+    for draw_id in sessions[current:]:
+        problems = reports[draw_id]
+        expected |= accounted[draw_id]
+        for line_no, draw, ticket, prize_name in drawn.get(draw_id, ()):
+            expected.add(ticket)
+            if ticket not in stored_prizes:
+                problems.append(f"line {line_no}: draw {draw} winner {ticket} ({prize_name}) is missing from the stored results")
+            elif stored_prizes[ticket] != prize_name:
+                problems.append(f"line {line_no}: draw {draw} winner {ticket} is stored with {stored_prizes[ticket]} "
+                                f"instead of {prize_name}")
+    extra = sorted(set(stored_prizes) - expected)
+    if extra and sessions:
+        # storage cannot say which session wrote a row, so report them against the latest one
+        reports[sessions[-1]].append(f"{len(extra)} stored winners were not drawn by any session: {extra[:5]}...")
+    return reports
+
+
+@serialized
 def initialize_draw():
     """(Re)initialize current_draw. Load previously saved winners from RESULTS_FILE if present,
        remove their tickets from available list and decrement prize counts accordingly.
@@ -223,158 +1132,856 @@ def initialize_draw():
     """
     global current_draw
 
-    # Load results from Excel files first
-    saved_results = load_results_from_excel()
+    # Load previously drawn winners from the configured storage backend
+    saved_results, bulk_tickets = storage.load()
 
-    # start with all tickets in range
-    all_tickets = list(range(TICKET_START, TICKET_END + 1))
-    random.shuffle(all_tickets)
-
-    # copy master prize counts
-    prize_counts = {name: {"count": meta["count"], "image": meta.get("image", "/static/prizes/default.jpg")}
-                    for name, meta in PRIZE_MASTER.items()}
+    # start with all tickets in range, minus every saved winner
+    used_tickets = {result['ticket_number'] for result in saved_results}
+    eligible = load_eligibility()
+    available_tickets = build_ticket_pool(used_tickets, eligible=eligible)
 
     # Initialize with empty state
+    seed = new_session_seed()
     current_draw.update({
         'initialized': True,
         'results': [],
-        'available_tickets': all_tickets.copy(),
-        'available_prizes': [],  # will be built after accounting for previously allocated prizes
-        'prize_counts_remaining': prize_counts,
+        'available_tickets': available_tickets,
+        'available_prizes': PrizeInventory(),  # master counts, decremented below for previous winners
         'total_drawn': 0,
-        'draw_id': datetime.now().strftime("%Y%m%d_%H%M%S")
+        'draw_id': new_draw_id(seed),
+        'bulk_tickets': bulk_tickets,
+        'seed': seed,
+        'eligible': eligible,
     })
+    storage.start_session(current_draw['draw_id'])
 
-    # Process saved results to update available tickets and prize counts
-    used_tickets = set()
+    # Process saved results to update prize counts
     for result in saved_results:
-        ticket_id = result['ticket_number']
         prize_name = result['prize_name']
 
         # Add to current results
         current_draw['results'].append(result)
 
-        # Remove ticket from available_tickets
-        if ticket_id in current_draw['available_tickets']:
-            current_draw['available_tickets'].remove(ticket_id)
-            used_tickets.add(ticket_id)
+        # Decrement prize count if present; bulk winners got PRIZE_MASTER_BULK clocks, not these (as in DrawEngine._sync)
+        if result['ticket_number'] not in bulk_tickets:
+            current_draw['available_prizes'].take(prize_name)
 
-        # Decrement prize count if present (only for main prizes, not bulk wall clocks)
-        if prize_name in current_draw['prize_counts_remaining']:
-            if current_draw['prize_counts_remaining'][prize_name]['count'] > 0:
-                current_draw['prize_counts_remaining'][prize_name]['count'] -= 1
-
-    current_draw['total_drawn'] = len([r for r in current_draw['results'] if r['rank'] <= 26])
-
-    # Build available_prizes list (expand counts into list of dicts)
-    current_draw['available_prizes'] = build_prize_list_from_counts(current_draw['prize_counts_remaining'])
-
-    # Shuffle available tickets and prizes
-    random.shuffle(current_draw['available_tickets'])
-    random.shuffle(current_draw['available_prizes'])
+    # bulk ranks restart at 1, so count draws by what they are, not by rank
+    current_draw['total_drawn'] = len([r for r in current_draw['results'] if r['ticket_number'] not in bulk_tickets])
+    prepare_schedule()
+    log_session_start()
+    reset_results_version()
+    publish_event('reset', {})
 
     # Save file if not exist: create empty with headers
     if not os.path.exists(RESULTS_FILE):
         df_empty = pd.DataFrame(columns=['Rank', 'Ticket Number', 'Ticket ID', 'Region', 'Prize Name', 'Prize Image'])
         df_empty.to_excel(RESULTS_FILE, index=False)
+        forget_workbook(RESULTS_FILE)
 
     print(
-        f"Draw initialized: {len(saved_results)} previous winners loaded ({len([r for r in saved_results if r['prize_name'] == 'Wall Clock' and r['rank'] > 26])} from bulk), {len(current_draw['available_tickets'])} tickets available, {len(current_draw['available_prizes'])} prizes available")
+        f"Draw initialized: {len(saved_results)} previous winners loaded ({len(bulk_tickets)} from bulk), {len(current_draw['available_tickets'])} tickets available, {len(current_draw['available_prizes'])} prizes available")
+
+
+_excel_write_lock = threading.Lock()
 
 
 def save_results_to_excel():
     """Write entire current_draw['results'] into RESULTS_FILE (overwrites file).
        Ensures previously loaded winners + newly drawn winners are saved together.
     """
-    if not current_draw['results']:
+    # from the published snapshot, so draws never wait on the export
+    snapshot = engine.snapshot
+    try:
+        write_results_workbook(snapshot.results[:snapshot.count])
+    except Exception as e:
+        print(f"Error saving to Excel: {e}")
+
+
+def write_results_workbook(results):
+    """Write `results` to RESULTS_FILE, replacing it. Raises if the workbook cannot be written."""
+    # Sort results by rank before saving; bulk winners live in RESULTS_FILE_BULK and are not duplicated here
+    bulk_tickets = current_draw['bulk_tickets']
+    sorted_results = sorted((r for r in results if r['ticket_number'] not in bulk_tickets), key=lambda x: x['rank'])
+
+    if not sorted_results:
         # ensure file exists with headers
         if not os.path.exists(RESULTS_FILE):
             df_empty = pd.DataFrame(
                 columns=['Rank', 'Ticket Number', 'Ticket ID', 'Region', 'Prize Name', 'Prize Image'])
             df_empty.to_excel(RESULTS_FILE, index=False)
+            forget_workbook(RESULTS_FILE)
         return
 
-    # Sort results by rank before saving
-    sorted_results = sorted(current_draw['results'], key=lambda x: x['rank'])
-
     df = pd.DataFrame(sorted_results)
     # Ensure columns exist and are ordered
     df = df[['rank', 'ticket', 'ticket_number', 'region', 'prize_name', 'prize_image']].copy()
     df.columns = ['Rank', 'Ticket Number', 'Ticket ID', 'Region', 'Prize Name', 'Prize Image']
 
-    try:
-        with pd.ExcelWriter(RESULTS_FILE, engine='openpyxl') as writer:
+    # Write to a temp file and swap it in, so readers never see a half-written workbook
+    base, ext = os.path.splitext(RESULTS_FILE)
+    tmp_file = f"{base}.{os.getpid()}.tmp{ext}"  # per process: several workers may export at once
+    with _excel_write_lock:
+        with pd.ExcelWriter(tmp_file, engine='openpyxl') as writer:
             df.to_excel(writer, index=False, sheet_name='Lottery Results')
-        print(f"Saved {len(df)} results to {RESULTS_FILE}")
-    except Exception as e:
-        print(f"Error saving to Excel: {e}")
+        os.replace(tmp_file, RESULTS_FILE)
+        forget_workbook(RESULTS_FILE)
+    print(f"Saved {len(df)} results to {RESULTS_FILE}")
+
+
+# Excel is an export of current_draw['results']; it is rewritten in the background, not per draw
+_export_requested = threading.Event()
+
+
+_export_worker_pid = None
+
+
+def _excel_export_worker():
+    while True:
+        _export_requested.wait()
+        _export_requested.clear()
+        engine.refresh()
+        save_results_to_excel()
+
+
+def schedule_excel_export():
+    """Ask the background writer to refresh RESULTS_FILE. Returns immediately."""
+    global _export_worker_pid
+    if _export_worker_pid != os.getpid():
+        # started lazily, once per process: threads do not survive a fork into a worker process
+        _export_worker_pid = os.getpid()
+        threading.Thread(target=_excel_export_worker, name='excel-export', daemon=True).start()
+    engine.after_commit(_export_requested.set)  # exports the snapshot, so not before it is published
+
+
+def _flush_pending_export():
+    if _export_requested.is_set():
+        _export_requested.clear()
+        save_results_to_excel()
+
+
+atexit.register(_flush_pending_export)
+
+
+def save_bulk_results_to_excel(results_bulk):
+    """Write the bulk Wall Clock winners to RESULTS_FILE_BULK."""
+    df = pd.DataFrame(results_bulk)
+    df = df[['rank', 'ticket', 'ticket_number', 'region', 'prize_name', 'prize_image']]
+    df.columns = ['Rank', 'Ticket Number', 'Ticket ID', 'Region', 'Prize Name', 'Prize Image']
+    df.to_excel(RESULTS_FILE_BULK, index=False)
+    forget_workbook(RESULTS_FILE_BULK)
+
+
+# ---------- Storage backends ----------
+# Both expose the same operations: load() -> (results, bulk_tickets), start_session(draw_id),
+# append(rows, bulk) for each draw before it is published (SQLite returns the rows' winners.id),
+# and replace(results) for an upload.
+# All calls except load() happen under engine.lock; they raise if the rows could not be saved.
+
+class ExcelStorage:
+    """Workbooks as the store: every draw is fsynced to JOURNAL_FILE, RESULTS_FILE is re-exported in the
+       background and RESULTS_FILE_BULK is written once by the bulk draw.
+    """
+
+    def load(self):
+        # Excel files first, then anything the journal has that the export missed
+        bulk_tickets = set()
+        results = load_results_from_excel(bulk_tickets)
+        replay_journal(results, bulk_tickets)
+        return results, bulk_tickets
+
+    def start_session(self, draw_id):
+        pass
+
+    def append(self, rows, bulk=False):
+        append_to_journal(rows, bulk=bulk)
+        if bulk:
+            save_bulk_results_to_excel(rows)
+
+    def replace(self, results):
+        # the workbook now holds everything, so earlier journal entries must not be replayed over it
+        write_results_workbook(results)
+        reset_journal()
+
+
+class SQLiteStorage:
+    """SQLite (WAL) as the store: each draw is one short transaction; workbooks are only exported.
+       On first use an empty database imports whatever RESULTS_FILE / RESULTS_FILE_BULK / JOURNAL_FILE hold.
+       Several worker processes can share one database (see SHARED_STATE): write_lock() linearizes
+       their draws and changes_since() pulls in what the others committed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS draws (
+            draw_id TEXT PRIMARY KEY,
+            started_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS winners (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            rank INTEGER NOT NULL,
+            ticket_number INTEGER NOT NULL UNIQUE,
+            ticket TEXT NOT NULL,
+            region TEXT NOT NULL,
+            region_color TEXT NOT NULL,
+            prize_name TEXT NOT NULL,
+            prize_image TEXT NOT NULL,
+            bulk INTEGER NOT NULL DEFAULT 0,
+            draw_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS winners_rank ON winners(rank);
+        CREATE INDEX IF NOT EXISTS winners_region ON winners(region);
+        -- remaining prizes are counted from winners on load; older databases kept an unread copy here
+        DROP TABLE IF EXISTS prize_inventory;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        -- starts random, so cursors handed out by an earlier database file never match this one
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', abs(random() % 4294967296));
+    """
+    COLUMNS = ('rank', 'ticket_number', 'ticket', 'region', 'region_color', 'prize_name', 'prize_image')
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._conn_pid = None
+        self._in_txn = False
+        self.epoch = None  # bumped by replace(); a change means another process swapped all results
+        self.last_id = 0  # highest winners.id this process has loaded or written
+        self._data_version = None
+        self.conn.executescript(self.SCHEMA)
+
+    @property
+    def conn(self):
+        # connections must not cross fork(); each worker process opens its own
+        if self._conn_pid != os.getpid():
+            # writes are serialized by engine.lock, so one connection per process is enough
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn_pid = os.getpid()
+            self._in_txn = False
+        return self._conn
+
+    @contextmanager
+    def write_lock(self):
+        """One write transaction. BEGIN IMMEDIATE takes SQLite's database-wide write lock, so across
+           processes only one holder at a time; nested calls join the outer transaction.
+        """
+        if self._in_txn:
+            yield
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_txn = True
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            try:
+                self.conn.execute("COMMIT")
+            except BaseException:
+                if self.conn.in_transaction:  # e.g. SQLITE_BUSY leaves it open
+                    self.conn.execute("ROLLBACK")
+                raise
+        finally:
+            self._in_txn = False
+
+    def _insert(self, rows, bulk):
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO winners ({', '.join(self.COLUMNS)}, bulk, draw_id) "
+            f"VALUES ({', '.join('?' * len(self.COLUMNS))}, ?, ?)",
+            [tuple(r[c] for c in self.COLUMNS) + (int(bulk), current_draw['draw_id']) for r in rows])
+        self.last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM winners").fetchone()[0]
+
+    def _select_winners(self, after_id=0, order='rank, id'):
+        cur = self.conn.execute(
+            f"SELECT id, {', '.join(self.COLUMNS)}, bulk FROM winners WHERE id > ? ORDER BY {order}", (after_id,))
+        rows = []
+        for row in cur:
+            self.last_id = max(self.last_id, row[0])
+            rows.append((dict(zip(self.COLUMNS, row[1:-1])), bool(row[-1]), row[0]))
+        return rows
+
+    def _read_epoch(self):
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+
+    def load(self):
+        if self.conn.execute("SELECT COUNT(*) FROM winners").fetchone()[0] == 0:
+            self._import_workbooks()
+        self.last_id = 0
+        self._data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        self.epoch = self._read_epoch()
+        rows = self._select_winners()
+        results = [r for r, _, _ in rows]
+        bulk_tickets = {r['ticket_number'] for r, bulk, _ in rows if bulk}
+        print(f"Loaded {len(results)} results from {self.path} ({len(bulk_tickets)} from bulk)")
+        return results, bulk_tickets
+
+    def _import_workbooks(self):
+        results, bulk_tickets = ExcelStorage().load()
+        with self.write_lock():
+            if self.conn.execute("SELECT COUNT(*) FROM winners").fetchone()[0]:
+                return  # another worker imported them first
+            self._insert([r for r in results if r['ticket_number'] not in bulk_tickets], bulk=False)
+            self._insert([r for r in results if r['ticket_number'] in bulk_tickets], bulk=True)
+        if results:
+            print(f"Imported {len(results)} results from workbooks into {self.path}")
+
+    def start_session(self, draw_id):
+        self.conn.execute("INSERT OR IGNORE INTO draws (draw_id, started_at) VALUES (?, ?)",
+                          (draw_id, datetime.now().isoformat(timespec='seconds')))
+
+    def append(self, rows, bulk=False):
+        with self.write_lock():
+            last_id = self.last_id
+            self._insert(rows, bulk)
+            ids = dict(self.conn.execute("SELECT ticket_number, id FROM winners WHERE id > ?", (last_id,)))
+        if bulk:
+            save_bulk_results_to_excel(rows)
+        return [ids[r['ticket_number']] for r in rows]
+
+    def replace(self, results):
+        with self.write_lock():
+            self.conn.execute("DELETE FROM winners")
+            self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'epoch'")
+            self._insert(results, bulk=False)
+            self.epoch = self._read_epoch()
+        write_results_workbook(results)
+
+    def changed(self):
+        """Cheap check: has any other connection committed since we last looked?"""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        return True
+
+    def changes_since(self):
+        """Rows other processes committed after the ones this process has seen, as
+           (reset, [(result, bulk, winners.id)]).
+           reset=True means the results were replaced wholesale and the caller must reload from load().
+        """
+        if self._read_epoch() != self.epoch:
+            return True, []
+        return False, self._select_winners(self.last_id, order='id')
+
+
+def make_storage(backend):
+    if backend == 'sqlite':
+        return SQLiteStorage(SQLITE_FILE)
+    if backend == 'excel':
+        return ExcelStorage()
+    raise ValueError(f"Unknown LOTTERY_STORAGE backend: {backend!r} (expected 'excel' or 'sqlite')")
+
+
+storage = make_storage(STORAGE_BACKEND)
+if SHARED_STATE and not isinstance(storage, SQLiteStorage):
+    raise RuntimeError("LOTTERY_SHARED_STATE=1 needs LOTTERY_STORAGE=sqlite: workers share state through the database")
+
+
+def _reset_locks_after_fork():
+    # a lock held by some other thread at fork() time would stay held forever in the child
+    global _stream_subscribers_lock, _excel_write_lock
+    engine.lock = threading.RLock()
+    engine.committed = threading.Condition()
+    engine._depth = 0
+    _stream_subscribers_lock = threading.Lock()
+    _stream_subscribers.clear()
+    _excel_write_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def new_session_seed():
+    return int(os.environ.get('LOTTERY_SEED') or random.SystemRandom().getrandbits(64))
+
+
+def new_draw_id(seed):
+    """Session id: start time to the microsecond plus a seed suffix, so an upload in the same
+       second as the init (or two workers starting together) never reuse one draws row.
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{seed & 0xffffff:06x}"
+
+
+def draw_rng(seed, draw):
+    """Dedicated RNG for one draw of a session (`draw` is the draw number; the bulk draw uses draw_seed_sequence).
+       Derived from the session seed alone, so any draw can be replayed on its own, whichever
+       worker process made it.
+    """
+    return random.Random(f"{seed}:{draw}")
 
 
-def select_prize_for_draw():
-    """Select a prize from available_prizes following the rule:
-       - For draws 1..26 (i.e. when total_drawn < 26) do NOT select 'Wall Clock'
+def select_prize_for_draw(inventory, draw_number, rng):
+    """Select a prize from inventory following the rule:
+       - For draws 1..26 (i.e. when draw_number < 26) do NOT select 'Wall Clock'
        - From draw 26 onward, include 'Wall Clock' like others.
-       Returns a dict {'name','image'} and removes it from available_prizes.
+       Returns the prize name and removes it from inventory.
     """
-    if not current_draw['available_prizes']:
-        return None
-    exclude_wall_before = (current_draw['total_drawn'] < 26)
-    # filter candidates
-    candidates = []
-    for p in current_draw['available_prizes']:
-        if exclude_wall_before and p['name'].lower().startswith('wall clock'):
-            continue
-        candidates.append(p)
-    if not candidates:
+    mask = EARLY_DRAW_MASK if draw_number < 26 else None
+    i = inventory.sample(mask, rng)
+    if i is None:
         # if no candidate (e.g., only wall clocks remain but rule excludes them), then allow wall clocks only if there are no other prizes
-        candidates = current_draw['available_prizes'][:]
-    # choose random candidate instance (we will remove the first matching instance from available_prizes)
-    chosen = random.choice(candidates)
-    # remove one instance of chosen from available_prizes (remove by identity)
-    for i, p in enumerate(current_draw['available_prizes']):
-        if p['name'] == chosen['name'] and p.get('image') == chosen.get('image'):
-            current_draw['available_prizes'].pop(i)
-            break
-    # also decrement prize_counts_remaining (if tracked)
-    if chosen['name'] in current_draw['prize_counts_remaining']:
-        if current_draw['prize_counts_remaining'][chosen['name']]['count'] > 0:
-            current_draw['prize_counts_remaining'][chosen['name']]['count'] -= 1
-    return chosen
+        i = inventory.sample(rng=rng)
+    if i is None:
+        return None
+    name = PRIZE_NAMES[i]
+    inventory.take(name)
+    return name
 
 
-def draw_single_winner():
-    """Perform a single draw. Returns result dict or None if no winners left."""
-    if not current_draw['initialized']:
-        initialize_draw()
-    if current_draw['total_drawn'] >= TOTAL_WINNERS:
+def pick_winner(pool, inventory, draw_number, rng):
+    """One draw: a uniformly random ticket, then its prize. Both are removed from pool / inventory.
+       Returns (ticket, prize_name), or None once tickets or prizes run out.
+    """
+    ticket = pool.pop_random(rng)
+    if ticket is None:
         return None
-    # pick a ticket
-    if not current_draw['available_tickets']:
+    prize_name = select_prize_for_draw(inventory, draw_number, rng)
+    if prize_name is None:
         return None
-    ticket = current_draw['available_tickets'].pop()  # already shuffled
-    # pick prize respecting the 'wall clock' rule
-    prize = select_prize_for_draw()
-    if not prize:
-        # no prize available (shouldn't happen if counts correct)
+    return ticket, prize_name
+
+
+def draw_seed_sequence(seed, draw):
+    """NumPy counterpart of draw_rng: the SeedSequence a draw's Generators are spawned from."""
+    digest = hashlib.sha256(f"{seed}:{draw}".encode()).digest()
+    return np.random.SeedSequence(int.from_bytes(digest[:16], 'little'))
+
+
+def sample_group(candidates, quota, rng):
+    """`quota` of `candidates` without replacement, in draw order (all of them if there are fewer)."""
+    keys = rng.random(len(candidates))
+    if quota < len(candidates):
+        picked = np.argpartition(keys, quota)[:quota]
+        return candidates[picked[np.argsort(keys[picked])]]
+    return candidates[np.argsort(keys)]
+
+
+def segment_tickets(pos, labels):
+    """The remaining tickets (ascending, int64) of a TicketPool.segment()."""
+    live = pos >= 0
+    if isinstance(labels, np.ndarray):
+        return labels[live].astype(np.int64)
+    return np.flatnonzero(live) + labels
+
+
+def sample_region(segments, quota, rng):
+    """One region's bulk winners: its candidates pulled from its own pool segments (ascending, the
+       canonical order for replay), then `quota` of them sampled with `rng`.
+    """
+    candidates = [segment_tickets(pos, labels) for pos, labels in segments]
+    candidates = np.concatenate(candidates) if candidates else np.empty(0, dtype=np.int64)
+    return sample_group(candidates, quota, rng)
+
+
+_bulk_executor = (None, None)
+
+
+def bulk_executor():
+    """Executor for the per-region bulk draws (BULK_WORKERS > 0), or None to draw them in this thread.
+       Created once per process and kept, so a process pool is not forked again for every bulk draw.
+    """
+    global _bulk_executor
+    if BULK_WORKERS <= 0:
+        return None
+    pid, executor = _bulk_executor
+    if pid != os.getpid():
+        if BULK_EXECUTOR == 'process':
+            executor = ProcessPoolExecutor(BULK_WORKERS)
+        else:
+            executor = ThreadPoolExecutor(BULK_WORKERS)
+        _bulk_executor = (os.getpid(), executor)
+    return executor
+
+
+def pick_bulk_wall_clocks(pool, seed_sequence, executor=None):
+    """Draw every REGIONS_BULK quota and take the winners out of the pool (so bulk winners can never be
+       drawn again). Each region pulls its candidates straight off the pool's position index over its
+       own ranges and draws from its own stream spawned from `seed_sequence`; one more stream shuffles
+       the winners, so the result does not depend on whether or how regions run in parallel.
+       Returns (ranks, tickets, entries) arrays, shuffled for announcement; entries index REGIONS_BULK.
+    """
+    streams = [np.random.default_rng(s) for s in seed_sequence.spawn(len(REGIONS_BULK) + 1)]
+    segments = [[pool.segment(first, last) for first, last in ranges] for ranges in BULK_RANGES]
+    picked = list((executor.map if executor is not None else map)(sample_region, segments, BULK_QUOTAS, streams))
+    tickets = np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+    entries = np.repeat(np.arange(len(picked)), [len(p) for p in picked])
+    for t in tickets.tolist():
+        pool.discard(t)
+    # rank is the position before the shuffle: REGIONS_BULK order, then draw order within the region
+    perm = streams[-1].permutation(len(tickets))
+    return perm + 1, tickets[perm], entries[perm]
+
+
+def prepare_schedule():
+    """Precompute the remaining draws (PRECOMPUTE_SCHEDULE) for the state just loaded."""
+    current_draw['schedule'] = None
+    if not PRECOMPUTE_SCHEDULE:
+        return
+    seed = current_draw['seed']
+    started = time.perf_counter()
+    schedule = DrawSchedule(seed, current_draw['available_tickets'], current_draw['available_prizes'],
+                            current_draw['total_drawn'], bulk=not current_draw['bulk_tickets'])
+    current_draw['schedule'] = schedule
+    print(f"Draw schedule: {len(schedule)} draws and {len(schedule.bulk)} bulk winners precomputed in {(time.perf_counter() - started) * 1000:.1f} ms, "
+          f"sha256 {schedule.digest}")
+
+
+def scheduled_draw():
+    """Take the next scheduled (ticket, prize) out of the pool and inventory, or return None if there is
+       no schedule. A schedule the state has diverged from (e.g. edited results) is dropped for live draws.
+    """
+    schedule = current_draw['schedule']
+    if schedule is None:
         return None
+    entry = schedule.entry(current_draw['total_drawn'])
+    if entry is not None and entry[0] in current_draw['available_tickets'] \
+            and current_draw['available_prizes'].take(entry[1]):
+        current_draw['available_tickets'].discard(entry[0])
+        return entry
+    print("⚠️ Draw state no longer matches the precomputed schedule; drawing live from here")
+    current_draw['schedule'] = None
+    return None
+
+
+def encode_result(result):
+    return json.dumps(result, separators=(',', ':'))
+
+
+def encode_codes(table, keys):
+    """Dictionary-encode keys against table (appending keys not seen before); returns their ids."""
+    ids = {key: i for i, key in enumerate(table)}
+    codes = []
+    for key in keys:
+        code = ids.get(key)
+        if code is None:
+            code = ids[key] = len(table)
+            table.append(key)
+        codes.append(code)
+    return codes
+
+
+def index_results(rows, first):
+    """Add rows (at positions first, first + 1, ...) to the region and prize indexes and codes."""
+    region_index, prize_index = current_draw['region_index'], current_draw['prize_index']
+    for i, r in enumerate(rows, first):
+        region_index.setdefault(r['region'], []).append(i)
+        prize_index.setdefault(r['prize_name'], []).append(i)
+    # codes are appended after the table entries they point at, so a reader never sees a dangling id
+    current_draw['region_codes'].extend(
+        encode_codes(current_draw['region_table'], [(r['region'], r['region_color']) for r in rows]))
+    current_draw['prize_codes'].extend(
+        encode_codes(current_draw['prize_table'], [(r['prize_name'], r['prize_image']) for r in rows]))
+
+
+def persist_results(rows, bulk=False):
+    """Save rows to storage ahead of commit_results(), so readers never see a winner that is not saved;
+       returns what storage.append() does. If that fails the in-memory state (already advanced past
+       these rows) no longer matches storage: it is dropped, to be reloaded from storage on next use.
+    """
+    try:
+        return storage.append(rows, bulk=bulk)
+    except Exception as e:
+        current_draw['initialized'] = False
+        print(f"❌ Could not save {len(rows)} results, reloading the draw state from storage: {e}")
+        raise
 
-    current_draw['total_drawn'] += 1
-    rank = current_draw['total_drawn']
-    region_name, region_color = get_region(ticket)
-    result = {
-        'rank': rank,
-        'ticket_number': ticket,
-        'ticket': f"{ticket:05d}",
-        'region': region_name,
-        'region_color': region_color,
-        'prize_name': prize['name'],
-        'prize_image': prize.get('image', '/static/prizes/default.jpg'),
-    }
-    current_draw['results'].append(result)
-    save_results_to_excel()
-    return result
+
+def commit_results(rows, row_ids=None):
+    """Append newly drawn rows to current_draw['results'] under a new state version.
+       In SHARED_STATE mode `row_ids` are the rows' winners.id, which become their cursors.
+    """
+    current_draw['version'] += 1
+    cursors = row_ids if SHARED_STATE else [current_draw['version']] * len(rows)
+    current_draw['cursor'] = cursors[-1]
+    current_draw['results_json'].extend(encode_result(r) for r in rows)
+    first = len(current_draw['results'])
+    current_draw['results'].extend(rows)
+    current_draw['row_cursors'].extend(cursors)
+    current_draw['ticket_index'].update((r['ticket_number'], first + i) for i, r in enumerate(rows))
+    index_results(rows, first)
+    engine.publish()
+
+
+def reset_results_version():
+    """Mark current_draw['results'] as replaced wholesale (initialize/upload): clients must reload."""
+    current_draw['version'] += 1
+    if SHARED_STATE:
+        # positions in the shared database, so a cursor from one worker is good at any other (and across restarts)
+        current_draw['cursor_tag'] = f"db{storage.epoch:x}"
+        current_draw['cursor'] = storage.last_id
+    else:
+        current_draw['cursor_tag'] = process_tag()
+        current_draw['cursor'] = current_draw['version']
+    current_draw['base_cursor'] = current_draw['cursor']
+    current_draw['row_cursors'] = [current_draw['cursor']] * len(current_draw['results'])
+    current_draw['results_json'] = [encode_result(r) for r in current_draw['results']]
+    current_draw['ticket_index'] = {r['ticket_number']: i for i, r in enumerate(current_draw['results'])}
+    current_draw['region_index'] = {}
+    current_draw['prize_index'] = {}
+    current_draw['region_table'] = []
+    current_draw['prize_table'] = []
+    current_draw['region_codes'] = []
+    current_draw['prize_codes'] = []
+    index_results(current_draw['results'], 0)
+    engine.publish()
+
+
+_process_tag = (None, '')
+
+
+def process_tag():
+    """Unique to this process run: versions restart with the process and are counted per worker."""
+    global _process_tag
+    pid, tag = _process_tag
+    if pid != os.getpid():
+        pid = os.getpid()
+        tag = f"{pid:x}.{time.time_ns():x}"
+        _process_tag = (pid, tag)
+    return tag
+
+
+def results_cursor(snapshot):
+    """The `version` clients are given and pass back as ?since=: '<cursor tag>.<cursor>'."""
+    return f"{snapshot.cursor_tag}.{snapshot.cursor}"
+
+
+def results_since(snapshot, cursor):
+    """Return (reset, start) for a client that has seen everything up to `cursor`: it needs
+       snapshot.results[start:snapshot.count]. reset is True when it must drop what it has and take
+       that as the full list -- also for a cursor from another process run (or database), which means nothing here.
+    """
+    tag, _, position = (cursor or '').rpartition('.')
+    if tag != snapshot.cursor_tag or not position.isdigit():
+        return True, 0
+    position = int(position)
+    if position < snapshot.base_cursor or position > snapshot.cursor:
+        return True, 0
+    return False, bisect_right(snapshot.row_cursors, position, 0, snapshot.count)
+
+
+def columnar_body(snapshot, positions, **fields):
+    """/api/results?format=columnar body for the rows at `positions`: parallel ticket / rank / region id /
+       prize id arrays plus the region and prize tables the ids index. A row is rebuilt client-side as
+       ticket = ticket zero-padded to ticket_digits, (region, region_color) = regions[region],
+       (prize_name, prize_image) = prizes[prize].
+    """
+    results, region_codes, prize_codes = snapshot.results, snapshot.region_codes, snapshot.prize_codes
+    return json.dumps({
+        **snapshot.stats, 'version': results_cursor(snapshot), **fields,
+        'format': 'columnar', 'ticket_digits': TICKET_WIDTH,
+        'regions': snapshot.region_table[:], 'prizes': snapshot.prize_table[:],
+        'columns': {
+            'ticket': [results[i]['ticket_number'] for i in positions],
+            'rank': [results[i]['rank'] for i in positions],
+            'region': [region_codes[i] for i in positions],
+            'prize': [prize_codes[i] for i in positions],
+        },
+    }, separators=(',', ':')).encode()
+
+
+def results_body(snapshot, start=0, columnar=False, **fields):
+    """/api/results JSON body (stats, version, fields, results[start:]) spliced from the pre-encoded rows."""
+    if columnar:
+        return columnar_body(snapshot, range(start, snapshot.count), **fields)
+    head = json.dumps({**snapshot.stats, 'version': results_cursor(snapshot), **fields})
+    return f'{head[:-1]},"results":[{",".join(snapshot.results_json[start:snapshot.count])}]}}'.encode()
+
+
+# Full /api/results body for the latest version, per format: columnar -> (version, bytes). Entries are
+# replaced, never mutated.
+_results_body_cache = {}
+
+
+def full_results_body(snapshot, columnar=False):
+    version, body = _results_body_cache.get(columnar, (None, b''))
+    if version != snapshot.version:
+        body = results_body(snapshot, columnar=columnar)
+        _results_body_cache[columnar] = (snapshot.version, body)
+    return body
+
+
+# Orders for /api/results?sort=; 'drawn' is commit order. Ties on rank keep commit order.
+RESULTS_SORTS = ('rank', '-rank', 'drawn', '-drawn')
+# /api/results?format=: 'rows' is a list of row objects, 'columnar' see columnar_body
+RESULTS_FORMATS = ('rows', 'columnar')
+# Filtered + sorted positions per (version, region, prize, sort); entries for old versions are never hit again
+_query_cache = {}
+
+
+def query_results(snapshot, region=None, prize=None, sort='rank'):
+    """Positions in snapshot.results matching the region / prize filters, in `sort` order.
+       Filters are answered from the region and prize indexes, never by scanning the results.
+    """
+    key = (snapshot.version, region, prize, sort)
+    positions = _query_cache.get(key)
+    if positions is not None:
+        return positions
+
+    selected = None
+    for index, value in ((snapshot.region_index, region), (snapshot.prize_index, prize)):
+        if value is None:
+            continue
+        matches = index.get(value, [])
+        matches = matches[:bisect_right(matches, snapshot.count - 1)]  # only rows this snapshot holds
+        if selected is None:
+            selected = matches
+        else:
+            other = set(matches)
+            selected = [i for i in selected if i in other]
+    if selected is None:
+        selected = range(snapshot.count)
+
+    results = snapshot.results
+    if sort == 'rank':
+        positions = sorted(selected, key=lambda i: (results[i]['rank'], i))
+    elif sort == '-rank':
+        positions = sorted(selected, key=lambda i: (-results[i]['rank'], i))
+    elif sort == '-drawn':
+        positions = list(reversed(selected))
+    else:
+        positions = list(selected)
+    if len(_query_cache) >= 256:
+        _query_cache.clear()
+    _query_cache[key] = positions
+    return positions
+
+
+def results_page_body(snapshot, positions, page, page_size, columnar=False):
+    """/api/results JSON body for one page of `positions`, spliced from the pre-encoded rows."""
+    pages = max(1, -(-len(positions) // page_size))
+    rows = positions[(page - 1) * page_size:page * page_size]
+    fields = {'page': page, 'page_size': page_size, 'pages': pages, 'total': len(positions)}
+    if columnar:
+        return columnar_body(snapshot, rows, **fields)
+    head = json.dumps({**snapshot.stats, 'version': results_cursor(snapshot), **fields})
+    return f'{head[:-1]},"results":[{",".join(snapshot.results_json[i] for i in rows)}]}}'.encode()
+
+
+# /api/ticket bodies for recently looked-up tickets: ticket -> (version, bytes), valid while the version holds
+TICKET_CACHE_SIZE = 10_000
+_ticket_cache = {}
+
+
+def ticket_lookup_body(snapshot, ticket):
+    """/api/ticket JSON body for one ticket number, answered from the snapshot's ticket index."""
+    cached = _ticket_cache.get(ticket)
+    if cached is not None and cached[0] == snapshot.version:
+        return cached[1]
+    i = snapshot.ticket_index.get(ticket)
+    if i is not None and i < snapshot.count:
+        body = f'{{"won":true,"version":"{results_cursor(snapshot)}","result":{snapshot.results_json[i]}}}'
+    else:
+        region_name, _ = get_region(ticket)
+        body = json.dumps({'won': False, 'version': results_cursor(snapshot), 'ticket': format_ticket(ticket),
+                           'region': region_name}, separators=(',', ':'))
+    if len(_ticket_cache) >= TICKET_CACHE_SIZE:
+        _ticket_cache.clear()  # cheap bound; hot tickets are back after one lookup
+    body = body.encode()
+    _ticket_cache[ticket] = (snapshot.version, body)
+    return body
+
+
+# Live feed subscribers: one bounded queue per /api/stream client
+_stream_subscribers = []
+_stream_subscribers_lock = threading.Lock()
 
 
+def subscribe_stream():
+    q = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    q.dropped = False
+    with _stream_subscribers_lock:
+        _stream_subscribers.append(q)
+    return q
+
+
+def unsubscribe_stream(q):
+    with _stream_subscribers_lock:
+        if q in _stream_subscribers:
+            _stream_subscribers.remove(q)
+
+
+def publish_event(event, data):
+    """Push one Server-Sent Event to every /api/stream client without ever blocking the caller,
+       once the current mutation commits (see DrawEngine.after_commit).
+       A client whose queue is full is dropped; its browser reconnects and catches up via ?since=.
+    """
+    engine.after_commit(_send_event, event, data)
+
+
+def _send_event(event, data):
+    cursor = results_cursor(engine.snapshot)  # callers publish the commit first
+    data = dict(data, version=cursor, **draw_stats())
+    message = f"event: {event}\nid: {cursor}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    with _stream_subscribers_lock:
+        subscribers = list(_stream_subscribers)
+    for q in subscribers:
+        try:
+            q.put_nowait(message)
+        except queue.Full:
+            q.dropped = True
+            unsubscribe_stream(q)
+
+
+@serialized
+def draw_single_winner():
+    """Perform a single draw. Returns result dict or None if no winners left."""
+    results = draw_winners(1)
+    return results[0] if results else None
+
+
+@serialized
+def draw_winners(count):
+    """Draw up to `count` winners in one go (the batch form of draw_single_winner).
+       Each pick follows the same rules as a single draw; all of them are committed as one
+       version and persisted with a single storage write. Returns the results in rank order
+       (fewer than `count`, possibly none, once winners, tickets or prizes run out).
+    """
+    engine.ensure_initialized()
+    results = []
+    while len(results) < count:
+        if current_draw['total_drawn'] >= TOTAL_WINNERS:
+            break
+        entry = scheduled_draw()
+        if entry is None:
+            # pick a ticket, then a prize respecting the 'wall clock' rule
+            draw_number = current_draw['total_drawn']
+            entry = pick_winner(current_draw['available_tickets'], current_draw['available_prizes'], draw_number,
+                                draw_rng(current_draw['seed'], draw_number))
+            if entry is None:
+                # no ticket or prize available (shouldn't happen if counts correct)
+                break
+        ticket, prize_name = entry
+
+        current_draw['total_drawn'] += 1
+        rank = current_draw['total_drawn']
+        region_name, region_color = get_region(ticket)
+        results.append({
+            'rank': rank,
+            'ticket_number': ticket,
+            'ticket': format_ticket(ticket),
+            'region': region_name,
+            'region_color': region_color,
+            'prize_name': prize_name,
+            'prize_image': PRIZE_MASTER[prize_name]['image'],
+        })
+    if not results:
+        return results
+
+    row_ids = persist_results(results)
+    commit_results(results, row_ids)
+    schedule_excel_export()
+    log_session_draw(results[0]['rank'] - 1, results, row_ids)
+    for result in results:
+        publish_event('winner', {'winner': result})
+    return results
+
+
+@serialized
 def draw_bulk_wall_clocks():
     """
     Draw wall clock winners region-wise after 26 draws.
@@ -388,18 +1995,7 @@ def draw_bulk_wall_clocks():
     # 1. Exclude tickets from main results file (saved draws)
     if os.path.exists(RESULTS_FILE):
         try:
-            df_prev = pd.read_excel(RESULTS_FILE)
-            for _, row in df_prev.iterrows():
-                tid = None
-                for col in ['Ticket ID', 'Ticket Number', 'Ticket']:
-                    if col in row and not pd.isna(row[col]):
-                        try:
-                            tid = int(row[col])
-                            break
-                        except Exception:
-                            pass
-                if tid is not None:
-                    used_tickets.add(tid)
+            used_tickets.update(workbook_tickets(RESULTS_FILE))
         except Exception as e:
             print("Warning: could not read previous results:", e)
 
@@ -410,7 +2006,7 @@ def draw_bulk_wall_clocks():
     # 3. CRITICAL: Ensure we have exactly 26 draws excluded for bulk draw
     # If we have less than 26 in combined (file + session), something is wrong
     total_excluded_from_draws = len([r for r in current_draw['results'] if r['rank'] <= 26])
-    total_excluded_from_file = len([tid for tid in used_tickets if tid in range(TICKET_START, TICKET_END + 1)])
+    total_excluded_from_file = len([tid for tid in used_tickets if TICKET_START <= tid <= TICKET_END])
 
     print(f"Excluding {len(used_tickets)} tickets from bulk draw")
     print(f" - From file: {total_excluded_from_file} tickets")
@@ -421,61 +2017,52 @@ def draw_bulk_wall_clocks():
         # We should not proceed if we don't have 26 draws
         return []
 
-    # --- Prepare all tickets excluding used ones ---
-    all_tickets = [t for t in range(TICKET_START, TICKET_END + 1) if t not in used_tickets]
+    # --- Drop any used ticket the pool still holds (e.g. edited into the file by hand) ---
+    pool = current_draw['available_tickets']
+    for tid in used_tickets:
+        pool.discard(tid)
 
-    if len(all_tickets) < 111:  # We need 111 winners for wall clocks
-        print(f"⚠️ CRITICAL: Only {len(all_tickets)} tickets available, but need 111 for bulk draw!")
+    if len(pool) < 111:  # We need 111 winners for wall clocks
+        print(f"⚠️ CRITICAL: Only {len(pool)} tickets available, but need 111 for bulk draw!")
         return []
 
-    random.shuffle(all_tickets)
-
-    # --- Prepare results list ---
-    results_bulk = []
     total_needed = sum(r[1] for r in REGIONS_BULK)
     if total_needed != PRIZE_MASTER_BULK["Wall Clock"]["count"]:
         print("⚠️ Warning: Region counts do not sum to 111 total wall clocks!")
 
-    # --- For each region, draw given number of wall clocks ---
-    rank_counter = 1
     for region_name, count, color in REGIONS_BULK:
-        available_tickets_region = []
-        # find tickets in this region based on main REGIONS list
-        for ticket in all_tickets:
-            reg, _ = get_region(ticket)
-            if reg == region_name:
-                available_tickets_region.append(ticket)
-
-        if len(available_tickets_region) < count:
+        region_id = REGION_ID_BY_NAME.get(region_name, UNKNOWN_REGION_ID)
+        if pool.region_size(region_id) < count:
             print(
-                f"⚠️ Warning: Region {region_name} has only {len(available_tickets_region)} tickets but needs {count}")
-
-        random.shuffle(available_tickets_region)
-        selected_tickets = available_tickets_region[:count]
-
-        for t in selected_tickets:
-            results_bulk.append({
-                'rank': rank_counter,
-                'ticket_number': t,
-                'ticket': f"{t:05d}",
-                'region': region_name,
-                'region_color': color,
-                'prize_name': 'Wall Clock',
-                'prize_image': PRIZE_MASTER_BULK['Wall Clock']['image']
-            })
-            rank_counter += 1
-            # remove from global list so no duplicates
-            if t in all_tickets:
-                all_tickets.remove(t)
-
-    # --- Shuffle final bulk results ---
-    random.shuffle(results_bulk)
-
-    # --- Save to Excel ---
-    df = pd.DataFrame(results_bulk)
-    df = df[['rank', 'ticket', 'ticket_number', 'region', 'prize_name', 'prize_image']]
-    df.columns = ['Rank', 'Ticket Number', 'Ticket ID', 'Region', 'Prize Name', 'Prize Image']
-    df.to_excel(RESULTS_FILE_BULK, index=False)
+                f"⚠️ Warning: Region {region_name} has only {pool.region_size(region_id)} tickets but needs {count}")
+
+    # --- Draw every region's wall clocks (in parallel with BULK_WORKERS), then build the results column by column ---
+    ranks, tickets, entries = pick_bulk_wall_clocks(pool, draw_seed_sequence(current_draw['seed'], 'bulk'),
+                                                    bulk_executor())
+    region_names = np.asarray([name for name, _, _ in REGIONS_BULK], dtype=object)
+    region_colors = np.asarray([color for _, _, color in REGIONS_BULK], dtype=object)
+    tickets = tickets.tolist()
+    columns = {
+        'rank': ranks.tolist(),
+        'ticket_number': tickets,
+        'ticket': [format_ticket(t) for t in tickets],
+        'region': region_names[entries].tolist(),
+        'region_color': region_colors[entries].tolist(),
+        'prize_name': ['Wall Clock'] * len(tickets),
+        'prize_image': [PRIZE_MASTER_BULK['Wall Clock']['image']] * len(tickets),
+    }
+    keys = list(columns)
+    results_bulk = [dict(zip(keys, values)) for values in zip(*columns.values())]
+    if not results_bulk:
+        print("⚠️ CRITICAL: No tickets fall in any REGIONS_BULK region; nothing drawn")
+        return []
+
+    row_ids = persist_results(results_bulk, bulk=True)
+    current_draw['bulk_tickets'].update(r['ticket_number'] for r in results_bulk)
+    commit_results(results_bulk, row_ids)
+    schedule_excel_export()
+    log_session_draw('bulk', results_bulk, row_ids)
+    publish_event('bulk', {'results': results_bulk})
 
     print(f"✅ Bulk draw completed: {len(results_bulk)} wall clock winners selected")
 
@@ -535,11 +2122,7 @@ tr:nth-child(even) { background:#eaf6f1; }
     <div class="ticket-box">
       <h3>Lucky Ticket</h3>
       <div class="digits" id="digits">
-        <div class="digit" id="d0">0</div>
-        <div class="digit" id="d1">0</div>
-        <div class="digit" id="d2">0</div>
-        <div class="digit" id="d3">0</div>
-        <div class="digit" id="d4">0</div>
+        {% for i in range(ticket_digits) %}<div class="digit" id="d{{i}}">0</div>{% endfor %}
       </div>
       <hr width="100%" size="2">
       <div id="regionBadge">Region</div>
@@ -594,7 +2177,10 @@ const cheer = document.getElementById('cheer');
 const shownCount = document.getElementById('shownCount');
 const bulkBtn = document.getElementById('bulkBtn');
 
-let allResults = [];
+let pageResults = [];  // only the page on screen; the server filters, sorts and pages
+let totalPages = 1;
+let resultsVersion = null;
+let drawInProgress = false;  // this screen is animating its own draw; it reloads when the reveal ends
 let currentPage = 1;
 const rowsPerPage = 10;
 
@@ -636,13 +2222,11 @@ function updateStatsUI(total, drawn, remaining) {
 }
 
 function renderResultsTable() {
-  console.log(`Rendering ${allResults.length} results in table`);
+  console.log(`Rendering ${pageResults.length} results in table`);
   resultsBody.innerHTML = '';
   
-  // Sort results by rank in descending order for display (newest first)
-  const sortedResults = [...allResults].sort((a, b) => b.rank - a.rank);
-  
-  sortedResults.forEach(r => {
+  // The server returns the page already sorted by rank in descending order (newest first)
+  pageResults.forEach(r => {
     const tr = document.createElement('tr');
     tr.dataset.rank = r.rank;
 
@@ -664,35 +2248,28 @@ function renderResultsTable() {
     tr.appendChild(tdPrize);
     resultsBody.appendChild(tr);
   });
-  paginateTable();
 }
 
-function paginateTable() {
-  const rows = Array.from(resultsBody.children);
-  const totalPages = Math.max(1, Math.ceil(rows.length / rowsPerPage));
-  if (currentPage > totalPages) currentPage = totalPages;
-  rows.forEach((row, i) => {
-    const visible = (i >= (currentPage - 1) * rowsPerPage && i < currentPage * rowsPerPage);
-    row.style.display = visible ? '' : 'none';
-  });
+function paginateTable(total) {
   const pagination = document.getElementById('pagination');
   let html = '';
   for (let p = 1; p <= totalPages; p++) {
     html += `<button onclick="gotoPage(${p})" style="${p===currentPage ? 'background:#00755b;color:#fff;' : 'background:#e6f2ef;'}">${p}</button>`;
   }
   pagination.innerHTML = html;
-  shownCount.textContent = rows.length;
+  shownCount.textContent = total;
 }
 
 function gotoPage(p) { 
   currentPage = p; 
-  paginateTable(); 
+  loadResultsFromServer(); 
 }
 
 // ---------------------- DRAW PROCESS ----------------------
 
 drawBtn.onclick = async function() {
   drawBtn.disabled = true;
+  drawInProgress = true;
   statusText.textContent = "Rolling digits...";
 
   // ✅ Reset all digits to 0 for new draw
@@ -787,12 +2364,14 @@ drawBtn.onclick = async function() {
     statusText.textContent = "Error drawing prize.";
   } finally {
     drawBtn.disabled = false;
+    drawInProgress = false;
   }
 };
 
 // ---------------------- BULK DRAW PROCESS ----------------------
 bulkBtn.onclick = async function() {
   bulkBtn.disabled = true;
+  drawInProgress = true;
   statusText.textContent = "🎯 Preparing bulk draw for Wall Clocks...";
   drumroll.currentTime = 0; drumroll.loop = true; drumroll.play();
 
@@ -836,6 +2415,7 @@ bulkBtn.onclick = async function() {
     statusText.textContent = "Error drawing bulk prizes.";
   } finally {
     bulkBtn.disabled = false;
+    drawInProgress = false;
   }
 };
 
@@ -850,25 +2430,51 @@ uploadInput.onchange = async (e) => {
   const resp = await fetch('/api/upload', { method:'POST', body: formData });
   const stats = await resp.json();
   await loadResultsFromServer();
-  for (let d = 0; d < 5; d++) document.getElementById('d'+d).textContent = '0';
+  document.querySelectorAll('.digit').forEach(el => el.textContent = '0');
   regionBadge.textContent = 'Region'; regionBadge.style.backgroundColor = '';
   prizeBadge.textContent = 'Wall Clock'; prizeImage.src = '/static/prizes/wall_clock.jpg';
   statusText.textContent = 'Ready to draw';
 };
 
-async function loadResultsFromServer() {
+// loads are chained so an older page can never land on screen after a newer one
+let resultsLoad = Promise.resolve();
+function loadResultsFromServer() {
+  resultsLoad = resultsLoad.then(fetchResultsPage);
+  return resultsLoad;
+}
+
+// Rebuild row objects from a ?format=columnar response (parallel arrays + region / prize tables)
+function decodeColumnar(data) {
+  const c = data.columns;
+  return c.ticket.map((ticket, i) => {
+    const [region, region_color] = data.regions[c.region[i]];
+    const [prize_name, prize_image] = data.prizes[c.prize[i]];
+    return {rank: c.rank[i], ticket_number: ticket, ticket: String(ticket).padStart(data.ticket_digits, '0'),
+            region, region_color, prize_name, prize_image};
+  });
+}
+
+async function fetchResultsPage() {
   try {
     console.log('Loading results from server...');
-    const r = await fetch('/api/results');
+    // only the page on screen is fetched, however many winners have been drawn
+    const r = await fetch(`/api/results?page=${currentPage}&page_size=${rowsPerPage}&sort=-rank&format=columnar`);
     const data = await r.json();
     
     console.log('Server response:', data);
     
-    if (data.results && Array.isArray(data.results)) {
-      allResults = data.results;
+    if (data.columns && Array.isArray(data.columns.ticket)) {
+      if (currentPage > data.pages) {  // the page we were on no longer exists (e.g. after a reset)
+        currentPage = data.pages;
+        return fetchResultsPage();
+      }
+      pageResults = decodeColumnar(data);
+      totalPages = data.pages;
+      resultsVersion = data.version;
       renderResultsTable();
+      paginateTable(data.total);
       updateStatsUI(data.total_prizes, data.drawn_count, data.remaining_count);
-      console.log(`Loaded ${allResults.length} results from server`);
+      console.log(`Loaded page ${data.page} of ${data.pages} (${data.total} results) from server`);
     } else {
       console.error('Invalid response format from server:', data);
     }
@@ -885,6 +2491,17 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Also try loading after a short delay in case DOM isn't fully ready
 setTimeout(loadResultsFromServer, 1000);
+
+// Live feed: pick up winners drawn from any other screen without polling
+if (window.EventSource) {
+  const stream = new EventSource('/api/stream');
+  const onStreamEvent = (e) => {
+    const data = JSON.parse(e.data);
+    if (drawInProgress || data.version === resultsVersion) return;
+    loadResultsFromServer();
+  };
+  ['winner', 'bulk', 'reset', 'hello'].forEach(name => stream.addEventListener(name, onStreamEvent));
+}
 </script>
 </body>
 </html>
@@ -892,60 +2509,197 @@ setTimeout(loadResultsFromServer, 1000);
 
 
 # calling API
+# ---------- Conditional GET ----------
+# Responses carry strong ETags and `Cache-Control: no-cache`, so kiosks revalidate on every refresh and
+# get an empty 304 while nothing changed.
+
+def results_etag(snapshot, since=None, columnar=False):
+    """ETag for /api/results: the state's cursor (see results_cursor; in SHARED_STATE mode the same at
+       every worker, so a client bouncing between workers still gets 304s), scoped to where the body
+       was cut (?since= cursor or page query) and to the format.
+    """
+    etag = results_cursor(snapshot)
+    if since is not None:
+        etag = f"{etag}.{since}"
+    return f"{etag}.c" if columnar else etag
+
+
+def cacheable(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def not_modified(etag):
+    return cacheable(Response(status=304), etag)
+
+
+# The page only depends on constants: rendered once, with the ETag a hash of its bytes
+_index_page = None
+
+
 @app.route("/")
 def index():
-    if not current_draw['initialized']:
-        initialize_draw()
-    return render_template_string(HTML_TEMPLATE, total_winners=TOTAL_WINNERS)
+    global _index_page
+    engine.ensure_initialized()
+    if _index_page is None:
+        # one digit box per character of a formatted ticket
+        body = render_template_string(HTML_TEMPLATE, total_winners=TOTAL_WINNERS,
+                                      ticket_digits=TICKET_WIDTH).encode()
+        _index_page = (body, hashlib.sha256(body).hexdigest()[:32])
+    body, etag = _index_page
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+    return cacheable(Response(body, mimetype='text/html'), etag)
 
 
 @app.route("/api/draw", methods=["POST"])
+@serialized
 def api_draw():
-    # Restrict single draws after 26 have been completed
+    """Draw one winner, or with `count` (query string or JSON body) up to that many in one
+       transaction, returned as `winners` in rank order.
+    """
+    engine.ensure_initialized()
+    # Restrict single draws after 26 have been completed (checked under the draw lock, so
+    # concurrent requests can never push the count past the limit)
     if current_draw['total_drawn'] >= 26:
         return jsonify({
             "error": "Only bulk draw available now."
         }), 400
 
-    winner = draw_single_winner()
-    if winner is None:
-        return jsonify({
-            "error": "All winners drawn or no prize/ticket available."
-        }), 400
-
-    remaining_count = sum(meta['count'] for meta in current_draw['prize_counts_remaining'].values())
+    count = request.args.get('count', type=int)
+    if count is None and request.is_json:
+        count = (request.get_json(silent=True) or {}).get('count')
+    if count is None:
+        winner = draw_single_winner()
+        if winner is None:
+            return jsonify({
+                "error": "All winners drawn or no prize/ticket available."
+            }), 400
+        payload = {"winner": winner}
+    else:
+        if not isinstance(count, int) or count < 1:
+            return jsonify({"error": "count must be a positive integer."}), 400
+        # a batch stops where single draws stop: at the 26th draw
+        winners = draw_winners(min(count, 26 - current_draw['total_drawn']))
+        if not winners:
+            return jsonify({
+                "error": "All winners drawn or no prize/ticket available."
+            }), 400
+        payload = {"winners": winners}
 
     return jsonify({
         "total_prizes": TOTAL_WINNERS,
         "drawn_count": current_draw['total_drawn'],
         "remaining_count": max(0, TOTAL_WINNERS - current_draw['total_drawn']),
-        "winner": winner
+        **payload
     })
 
 
 @app.route("/api/results", methods=["GET"])
 def api_results():
-    """Return full results list and counts for UI to render (persistent after restart)."""
+    """Return full results list and counts for UI to render (persistent after restart).
+       With ?since=<version> (the `version` of an earlier response) only rows committed after it
+       are returned, unless the results were replaced since then or the cursor is not from this
+       process run (reset=true, full list).
+       With any of ?page=, ?page_size=, ?region=, ?prize=, ?sort= (one of RESULTS_SORTS) only that
+       page of the filtered, sorted rows is returned, with `total` and `pages`.
+       ?format=columnar returns any of these as parallel arrays plus region / prize tables (see columnar_body).
+    """
     # Ensure draw is initialized from Excel if Flask restarted
-    if not current_draw['initialized']:
-        initialize_draw()
-
-    remaining_count = sum(meta['count'] for meta in current_draw['prize_counts_remaining'].values())
+    engine.ensure_initialized()
+    engine.refresh()
+    # read from the published snapshot: never waits for a draw or upload in progress
+    snapshot = engine.snapshot
+
+    columnar = request.args.get('format', 'rows')
+    if columnar not in RESULTS_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(RESULTS_FORMATS)}."}), 400
+    columnar = columnar == 'columnar'
+    since = request.args.get('since')
+    paged = since is None and any(arg in request.args for arg in ('page', 'page_size', 'region', 'prize', 'sort'))
+    if since is not None:
+        reset, start = results_since(snapshot, since)
+        # a valid cursor has this snapshot's tag, so its position alone says where the body starts
+        etag = results_etag(snapshot, 'r' if reset else since.rpartition('.')[2], columnar)
+    elif paged:
+        sort = request.args.get('sort', 'rank')
+        if sort not in RESULTS_SORTS:
+            return jsonify({"error": f"sort must be one of {', '.join(RESULTS_SORTS)}."}), 400
+        etag = results_etag(snapshot, 'q' + hashlib.blake2b(request.query_string, digest_size=8).hexdigest(),
+                            columnar)
+    else:
+        etag = results_etag(snapshot, None, columnar)
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+
+    # bodies are spliced from rows encoded once at commit; the full list is cached per version
+    if paged:
+        page = max(request.args.get('page', 1, type=int), 1)
+        page_size = min(max(request.args.get('page_size', RESULTS_PAGE_SIZE, type=int), 1), RESULTS_MAX_PAGE_SIZE)
+        positions = query_results(snapshot, request.args.get('region'), request.args.get('prize'), sort)
+        body = results_page_body(snapshot, positions, page, page_size, columnar)
+    elif since is not None:
+        body = results_body(snapshot, start, columnar, reset=reset)
+    else:
+        body = full_results_body(snapshot, columnar)
+    return cacheable(Response(body, mimetype='application/json'), etag)
+
+@app.route("/api/results/wait", methods=["GET"])
+def api_results_wait():
+    """Long-poll for displays that cannot use /api/stream: parks until a commit moves the version
+       past ?since= (or ?timeout= seconds pass) and returns the same body as /api/results?since=.
+       Without ?since= it answers at once with the full list. Takes ?format= like /api/results.
+    """
+    columnar = request.args.get('format', 'rows')
+    if columnar not in RESULTS_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(RESULTS_FORMATS)}."}), 400
+    engine.ensure_initialized()
+    since = request.args.get('since')
+    timeout = min(max(request.args.get('timeout', LONG_POLL_TIMEOUT, type=float), 0), LONG_POLL_TIMEOUT)
+    snapshot = engine.snapshot if since is None else engine.wait_for_commit(since, timeout)
 
-    print(
-        f"API Results: returning {len(current_draw['results'])} results, drawn_count: {current_draw['total_drawn']}, remaining: {max(0, TOTAL_WINNERS - current_draw['total_drawn'])}")
+    reset, start = results_since(snapshot, since)
+    return Response(results_body(snapshot, start, columnar == 'columnar', reset=reset), mimetype='application/json')
 
-    # Debug: print first few results to verify they're loaded
-    for i, result in enumerate(current_draw['results'][:5]):
-        print(f"Result {i + 1}: Rank {result['rank']}, Ticket {result['ticket']}, Prize {result['prize_name']}")
 
+@app.route("/api/ticket/<number>", methods=["GET"])
+def api_ticket(number):
+    """Did this ticket win? Looked up in the published snapshot, so it never waits for a draw."""
+    try:
+        ticket = int(number.strip())
+    except ValueError:
+        return jsonify({"error": "Ticket number must be numeric."}), 400
+    engine.ensure_initialized()
+    engine.refresh()
+    return Response(ticket_lookup_body(engine.snapshot, ticket), mimetype='application/json')
+
+
+@app.route("/api/schedule", methods=["GET"])
+def api_schedule():
+    """Seal of the precomputed draw schedule: its sha256 can be announced before the draws start."""
+    engine.ensure_initialized()
+    schedule = current_draw['schedule']
+    if schedule is None:
+        return jsonify({"error": "No precomputed schedule (set LOTTERY_SCHEDULE=1)."}), 404
     return jsonify({
-        "total_prizes": TOTAL_WINNERS,
-        "drawn_count": current_draw['total_drawn'],
-        "remaining_count": max(0, TOTAL_WINNERS - current_draw['total_drawn']),
-        "results": current_draw['results']
+        "draw_id": current_draw['draw_id'],
+        "start": schedule.start,
+        "length": len(schedule),
+        "bulk": len(schedule.bulk),
+        "next": current_draw['total_drawn'],
+        "sha256": schedule.digest
     })
 
+
+@app.route("/api/export", methods=["GET"])
+def api_export():
+    """Write RESULTS_FILE from the current results right now and download it."""
+    engine.ensure_initialized()
+    save_results_to_excel()
+    return send_file(os.path.abspath(RESULTS_FILE), as_attachment=True)
+
+
 @app.route("/api/upload", methods=["POST"])
 def api_upload():
     """Upload an Excel (same format as saved) to populate/overwrite session results.
@@ -961,68 +2715,58 @@ def api_upload():
         return jsonify({"error": f"Could not read uploaded file: {e}"}), 400
 
     # Validate and convert rows
-    rows = []
-    prize_counts = {name: {"count": meta["count"], "image": meta.get("image", "/static/prizes/default.jpg")} for
-                    name, meta in PRIZE_MASTER.items()}
-    tickets_taken = set()
-    for _, row in df.iterrows():
-        ticket_id = None
-        try:
-            if 'Ticket ID' in row and not pd.isna(row['Ticket ID']):
-                ticket_id = int(row['Ticket ID'])
-            elif 'Ticket Number' in row and not pd.isna(row['Ticket Number']):
-                ticket_id = int(row['Ticket Number'])
-            elif 'Ticket' in row and not pd.isna(row['Ticket']):
-                ticket_id = int(str(row['Ticket']).strip())
-        except Exception:
-            continue
-        prize_name = str(row.get('Prize Name', '')).strip()
-        rank = int(row.get('Rank', 0)) if not pd.isna(row.get('Rank', 0)) else 0
-        prize_image = row.get('Prize Image',
-                              PRIZE_MASTER.get(prize_name, {}).get('image', '/static/prizes/default.jpg'))
+    rows = results_from_frame(df, '/static/prizes/default.jpg', file.filename or 'upload')
+    tickets_taken = {r['ticket_number'] for r in rows}
+    # decrement master prize counts by the prizes already handed out
+    prize_counts = {name: meta['count'] for name, meta in PRIZE_MASTER.items()}
+    for prize_name, taken in Counter(r['prize_name'] for r in rows).items():
+        if prize_name in prize_counts:
+            prize_counts[prize_name] = max(0, prize_counts[prize_name] - taken)
 
-        if ticket_id is None:
-            continue
-        region_name, region_color = get_region(ticket_id)
-        rows.append({
-            'rank': rank, 'ticket_number': ticket_id, 'ticket': f"{ticket_id:05d}",
-            'region': region_name, 'region_color': region_color,
-            'prize_name': prize_name, 'prize_image': prize_image
-        })
-        tickets_taken.add(ticket_id)
-        # decrement prize_counts if exists
-        if prize_name in prize_counts and prize_counts[prize_name]['count'] > 0:
-            prize_counts[prize_name]['count'] -= 1
-
-    # Overwrite in-memory state based on uploaded file
-    current_draw['results'] = sorted(rows, key=lambda r: r['rank'])  # keep ascending rank order
-    current_draw['total_drawn'] = len(current_draw['results'])
-    # rebuild available tickets
-    all_tickets = list(range(TICKET_START, TICKET_END + 1))
-    current_draw['available_tickets'] = [t for t in all_tickets if t not in tickets_taken]
-    # rebuild remaining prizes list and counts
-    current_draw['prize_counts_remaining'] = prize_counts
-    current_draw['available_prizes'] = build_prize_list_from_counts(
-        {k: {'count': v['count'], 'image': v['image']} for k, v in prize_counts.items()})
-    random.shuffle(current_draw['available_tickets'])
-    random.shuffle(current_draw['available_prizes'])
-    # Save uploaded data to RESULTS_FILE so it's persisted as base for the next session
-    save_results_to_excel()
+    # rebuild available tickets (outside the lock: draws keep running until the swap below)
+    available_tickets = build_ticket_pool(tickets_taken, eligible=current_draw['eligible'])
+
+    try:
+        with engine.mutation():
+            # Overwrite in-memory state based on uploaded file
+            current_draw['results'] = sorted(rows, key=lambda r: r['rank'])  # keep ascending rank order
+            current_draw['total_drawn'] = len(current_draw['results'])
+            current_draw['bulk_tickets'] = set()
+            current_draw['available_tickets'] = available_tickets
+            # rebuild remaining prize counts
+            current_draw['available_prizes'] = PrizeInventory(prize_counts)
+            # a new session: draws after the upload must not rerun the streams the same draw numbers used before
+            current_draw['seed'] = new_session_seed()
+            current_draw['draw_id'] = new_draw_id(current_draw['seed'])
+            # Persist uploaded data as the base for the next session, before anyone can see it
+            try:
+                storage.replace(current_draw['results'])
+            except Exception:
+                current_draw['initialized'] = False  # reloaded from storage on next use
+                raise  # out of mutation(), so a shared database rolls the replace back
+            storage.start_session(current_draw['draw_id'])
+            prepare_schedule()
+            log_session_start(replaced=True)
+            reset_results_version()
+            publish_event('reset', {})
+            stats = draw_stats()
+    except Exception as e:
+        return jsonify({"error": f"Could not save uploaded results: {e}"}), 500
 
     return jsonify({
-        "total_prizes": TOTAL_WINNERS,
-        "drawn_count": current_draw['total_drawn'],
-        "remaining_count": max(0, TOTAL_WINNERS - current_draw['total_drawn']),
+        **stats,
         "message": "Uploaded and loaded results."
     })
 
 
 @app.route("/api/draw_bulk", methods=["POST"])
+@serialized
 def api_draw_bulk():
     """
     API endpoint to trigger the bulk Wall Clock draw.
     Returns JSON with summary and winners list.
     """
+    engine.ensure_initialized()
     # Ensure main draw has reached exactly 26
     total_main_draws = len([r for r in current_draw['results'] if r['prize_name'] != 'Wall Clock' or r['rank'] <= 26])
 
@@ -1041,7 +2785,7 @@ def api_draw_bulk():
     # Prevent multiple bulk draws (if already performed)
     if os.path.exists(RESULTS_FILE_BULK):
         try:
-            df_bulk_existing = pd.read_excel(RESULTS_FILE_BULK)
+            df_bulk_existing = read_workbook(RESULTS_FILE_BULK)
             if not df_bulk_existing.empty and len(df_bulk_existing) >= PRIZE_MASTER_BULK["Wall Clock"]["count"]:
                 return jsonify({
                     "error": "Bulk draw already completed. 111 Wall Clock winners have been selected."
@@ -1053,9 +2797,6 @@ def api_draw_bulk():
     try:
         results_bulk = draw_bulk_wall_clocks()
 
-        # CRITICAL: After bulk draw, save ALL current results to ensure consistency
-        save_results_to_excel()
-
     except Exception as e:
         return jsonify({
             "error": f"Bulk draw failed: {str(e)}"
@@ -1070,6 +2811,66 @@ def api_draw_bulk():
     })
 
 
+@app.route("/api/stream", methods=["GET"])
+def api_stream():
+    """Server-Sent Events feed: 'winner', 'bulk' and 'reset' events as soon as they are committed.
+       Each event carries the new state version and stats, so screens refresh with /api/results?since=.
+    """
+    engine.ensure_initialized()
+    engine.refresh()
+    q = subscribe_stream()
+
+    def events():
+        try:
+            # tell the client where it stands right away, so it can catch up with ?since=
+            snapshot = engine.snapshot
+            cursor = results_cursor(snapshot)
+            yield f"event: hello\nid: {cursor}\ndata: {json.dumps(dict(snapshot.stats, version=cursor))}\n\n"
+            while True:
+                try:
+                    yield q.get(timeout=STREAM_KEEPALIVE)
+                except queue.Empty:
+                    if q.dropped:
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                if q.dropped and q.empty():
+                    return
+        finally:
+            unsubscribe_stream(q)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ADBL Festive Lucky Draw server")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--verify', nargs='+', metavar='SESSION_LOG',
+                        help="replay the draws in these session logs from their seeds and exit")
+    parser.add_argument('--import-sales', metavar='SALES_FILE',
+                        help=f"build {ELIGIBILITY_FILE} from a CSV/Excel sales export and exit")
+    args = parser.parse_args()
+
+    if args.import_sales:
+        started = time.perf_counter()
+        import_sales_file(args.import_sales)
+        print(f"Import took {time.perf_counter() - started:.2f}s")
+        raise SystemExit(0)
+
+    if args.verify:
+        failed = 0
+        for path in args.verify:
+            started = time.perf_counter()
+            reports = verify_session_log(path)
+            for draw_id, problems in reports.items():
+                for problem in problems:
+                    print(f"❌ {path} session {draw_id}: {problem}")
+            failed += sum(1 for problems in reports.values() if problems)
+            print(f"{path}: {len(reports)} sessions replayed in {time.perf_counter() - started:.2f}s")
+        raise SystemExit(1 if failed else 0)
+
     initialize_draw()
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=args.port)
\ No newline at end of file
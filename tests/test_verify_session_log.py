@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main_code_deep_11 as lottery
+
+
+@pytest.fixture
+def drawn_session(tmp_path, monkeypatch):
+    """A fresh session in tmp_path with a few draws, exported synchronously to RESULTS_FILE."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(lottery, 'schedule_excel_export', lambda: None)
+    lottery.current_draw['initialized'] = False
+    lottery.initialize_draw()
+    client = lottery.app.test_client()
+    assert client.post('/api/draw?count=5').status_code == 200
+    assert client.post('/api/draw').status_code == 200
+    lottery.save_results_to_excel()
+    return tmp_path
+
+
+def test_untouched_session_verifies(drawn_session):
+    reports = lottery.verify_session_log()
+    assert reports and all(problems == [] for problems in reports.values())
+
+
+def test_tampered_workbook_is_reported(drawn_session):
+    df = pd.read_excel(lottery.RESULTS_FILE)
+    winners = set(df['Ticket ID'])
+    replacement = next(t for t in range(lottery.TICKET_START, lottery.TICKET_END + 1) if t not in winners)
+    first = df['Rank'].idxmin()
+    df.loc[first, 'Ticket ID'] = replacement
+    df.to_excel(lottery.RESULTS_FILE, index=False)
+    lottery.reset_journal()  # as after an upload: the workbook is the only copy
+
+    reports = lottery.verify_session_log()
+    problems = [problem for session in reports.values() for problem in session]
+    assert any('missing from the stored results' in problem for problem in problems)
+    assert any(str(replacement) in problem for problem in problems)